@@ -1,3 +1,7 @@
+import logging
+import queue
+from contextlib import asynccontextmanager
+from logging.handlers import QueueHandler, QueueListener
 from pinecone import Pinecone
 from introlix.config import PINECONE_KEY
 from fastapi import FastAPI, HTTPException, Query
@@ -8,8 +12,35 @@ from introlix.routes.chat import chat_router
 from introlix.routes.research_desk import research_desk_router
 from fastapi.middleware.cors import CORSMiddleware
 from pymongo import DESCENDING
+from introlix.tools.web_crawler import aclose as close_web_crawler
+from introlix.utils.http import close_session as close_http_session
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Route root logging through a queue so request handlers never block on
+    # stream I/O; a background listener thread does the actual writes
+    root = logging.getLogger()
+    original_handlers = root.handlers[:]
+    log_queue = queue.SimpleQueue()
+    listener = QueueListener(
+        log_queue,
+        *(original_handlers or [logging.StreamHandler()]),
+        respect_handler_level=True,
+    )
+    root.handlers = [QueueHandler(log_queue)]
+    listener.start()
+    try:
+        yield
+    finally:
+        # Release shared outbound HTTP resources
+        await close_web_crawler()
+        await close_http_session()
+        listener.stop()
+        root.handlers = original_handlers
+
 
-app = FastAPI(title="Introlix", openapi_prefix="/api/v1")
+app = FastAPI(title="Introlix", openapi_prefix="/api/v1", lifespan=lifespan)
 pc = Pinecone(api_key=PINECONE_KEY)
 
 app.add_middleware(
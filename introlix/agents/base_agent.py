@@ -82,15 +82,18 @@ class Agent(BaseAgent):
         This method performs several cleaning steps:
         1. Removes <think> tags and their content (often used by reasoning models).
         2. Strips Markdown code block delimiters.
-        3. Parses the cleaned string as JSON.
-        4. Handles nested response structures (e.g., {'type': 'final', 'answer': ...}).
-        5. Validates the resulting dictionary against `output_model_class`.
+        3. Hands the cleaned string to `config.output_parser` if one is set, and
+           returns its result as-is.
+        4. Otherwise parses the cleaned string as JSON.
+        5. Handles nested response structures (e.g., {'type': 'final', 'answer': ...}).
+        6. Validates the resulting dictionary against `output_model_class`.
 
         Args:
             raw_output (str): The raw string response from the LLM.
 
         Returns:
-            Any: An instance of `output_model_class` containing the validated data.
+            Any: An instance of `output_model_class` containing the validated data,
+                 or whatever the configured `output_parser` returns.
 
         Raises:
             ValueError: If the output cannot be parsed as JSON.
@@ -110,7 +113,11 @@ class Agent(BaseAgent):
                 cleaned = re.sub(r'\n```\s*$', '', cleaned)
                 cleaned = cleaned.strip()
             
-            # Step 3: Try to parse as JSON
+            # Step 3: A custom parser takes over from here
+            if self.config is not None and self.config.output_parser:
+                return self.config.output_parser(cleaned)
+
+            # Step 4: Try to parse as JSON
             try:
                 parsed_json = json.loads(cleaned)
             except json.JSONDecodeError as e:
@@ -118,12 +125,12 @@ class Agent(BaseAgent):
                 self.logger.error(f"Attempted to parse: {cleaned[:200]}...")
                 raise ValueError(f"Invalid JSON: {e}")
             
-            # Step 4: Handle nested {"type": "final", "answer": {...}} structure
+            # Step 5: Handle nested {"type": "final", "answer": {...}} structure
             if isinstance(parsed_json, dict):
                 if parsed_json.get("type") == "final" and "answer" in parsed_json:
                     parsed_json = parsed_json["answer"]
             
-            # Step 5: Validate with output_model_class
+            # Step 6: Validate with output_model_class
             return self.output_model_class(**parsed_json)
             
         except Exception as e:
@@ -19,6 +19,11 @@ APP_AUTHOR = "introlix-ai"
 # model config
 HF_MODEL_URL = "https://huggingface.co/{username}/{repo_id}/resolve/{branch_name}/{model_name}?download=true"
 MODEL_SAVE_DIR = Path(user_data_dir(appname=APP_NAME, appauthor=APP_AUTHOR)) / "models"
+# Run gc.collect() + torch.cuda.empty_cache() after unloading a local model.
+# Off by default; enable it if GPU memory fragmentation causes load failures.
+LLM_AGGRESSIVE_FREE = os.environ.get("INTROLIX_AGGRESSIVE_FREE", "false").lower() in ("1", "true", "yes")
+# Number of local models kept loaded at once; size it to the available RAM/VRAM
+LLM_MAX_LOADED = int(os.environ.get("INTROLIX_MAX_LOADED", "2"))
 
 # cloud provider
 CLOUD_PROVIDER = "google_ai_studio"  # or "openrouter"
@@ -1,6 +1,10 @@
+import logging
+import orjson
 from typing import List, Dict, Union, AsyncGenerator
 from introlix.services.LLMState import LLMState
 
+logger = logging.getLogger(__name__)
+
 llm_state = LLMState()
 
 
@@ -32,10 +36,11 @@ async def cloud_llm_manager(
             return response
         else:
             # Non-streaming response
-            output = response.json()
+            output = orjson.loads(response.content)
             try:
                 return output["choices"][0]["message"]["content"]
-            except:
+            except (KeyError, IndexError, TypeError):
+                logger.warning("Unexpected OpenRouter response: %s", output)
                 return output
             
     elif provider == "google_ai_studio":
@@ -47,9 +52,10 @@ async def cloud_llm_manager(
             return response
 
         # Gemini-specific JSON parsing
-        output = response.json()
+        output = orjson.loads(response.content)
         try:
             # Extract text from Gemini structure: candidates[0].content.parts[0].text
             return output["candidates"][0]["content"]["parts"][0]["text"]
         except (KeyError, IndexError, TypeError):
+            logger.warning("Unexpected Gemini response: %s", output)
             return str(output)  # Fallback for debugging errors
@@ -21,39 +21,133 @@ Supported Providers:
 - OpenRouter: Various cloud models
 """
 
-import os
+import re
 import asyncio
 import gc
 import requests
+from collections import OrderedDict
 import json
+import orjson
+from json.decoder import scanstring
 from fastapi import HTTPException
 from llama_cpp import Llama
-from typing import Optional, AsyncGenerator, Union
-from introlix.config import MODEL_SAVE_DIR, OPEN_ROUTER_KEY, GEMINI_API_KEY
+from typing import Optional, AsyncGenerator, Union, Dict
+from introlix.services.model_path import resolve_model_path
+from introlix.config import (
+    OPEN_ROUTER_KEY,
+    GEMINI_API_KEY,
+    LLM_AGGRESSIVE_FREE,
+    LLM_MAX_LOADED,
+)
+
+# torch is only used to release cached GPU memory. Import it once here so that
+# loading/unloading a model never pays the import (or the driver query) while
+# holding the model lock.
+try:
+    import torch
+
+    _HAS_CUDA = torch.cuda.is_available()
+except ImportError:
+    torch = None
+    _HAS_CUDA = False
+
+# Fast paths that pull the text delta straight out of an SSE line without building
+# a dict. Anything they don't match falls back to a full JSON parse.
+_OPENROUTER_CONTENT_RE = re.compile(
+    rb'"delta"\s*:\s*\{\s*(?:"role"\s*:\s*"[a-z]+"\s*,\s*)?"content"\s*:\s*"((?:[^"\\]|\\.)*)"'
+)
+_GEMINI_TEXT_RE = re.compile(
+    rb'"parts"\s*:\s*\[\s*\{\s*"text"\s*:\s*"((?:[^"\\]|\\.)*)"'
+)
+
+
+def _unescape_json_string(raw: bytes) -> str:
+    """
+    Decode the body of a JSON string literal (without its quotes) to ``str``.
+    """
+    text = raw.decode("utf-8")
+    if "\\" in text:
+        text = scanstring(text + '"', 0)[0]
+    return text
+
 
 class LLMState:
     """
     Manages LLM instances and API interactions for the application.
 
     This class provides a singleton-like state manager for LLMs, handling:
-    - Loading and unloading of local llama.cpp models
+    - Loading and unloading of local llama.cpp models, keeping the most recently
+      used ones resident so switching back to them is free
     - API calls to Google Gemini and OpenRouter
     - Streaming and non-streaming responses
-    - Memory management and GPU cache clearing
+    - Memory management and optional GPU cache clearing
 
     Attributes:
-        llm (Optional[Llama]): The currently loaded llama.cpp model instance.
-        current_model_name (Optional[str]): Name of the currently loaded model.
-        lock (asyncio.Lock): Async lock for thread-safe model operations.
+        llm (Optional[Llama]): The most recently used llama.cpp model instance.
+        current_model_name (Optional[str]): Name of the most recently used model.
+        lock (asyncio.Lock): Async lock guarding updates to the loaded models.
+        aggressive_free (bool): Whether to force garbage collection and clear the
+            CUDA cache after a model is released.
+        max_loaded (int): Maximum number of models kept loaded at once.
     """
 
-    def __init__(self):
+    def __init__(
+        self,
+        aggressive_free: bool = LLM_AGGRESSIVE_FREE,
+        max_loaded: int = LLM_MAX_LOADED,
+    ):
         """
         Initialize the LLM state manager.
+
+        Args:
+            aggressive_free (bool): Run ``gc.collect()`` and ``torch.cuda.empty_cache()``
+                after a model is released. Both are slow (a full heap walk and a CUDA
+                sync), and llama.cpp frees its own memory when the model is dropped, so
+                this is off by default. Enable it only if fragmentation causes loads to
+                fail. Defaults to the ``INTROLIX_AGGRESSIVE_FREE`` environment variable.
+            max_loaded (int): Maximum number of models kept loaded. The least recently
+                used model is evicted when a new one would exceed it. Defaults to the
+                ``INTROLIX_MAX_LOADED`` environment variable, or 2.
         """
-        self.llm: Optional[Llama] = None
+        # Loaded models in least- to most-recently-used order
+        self._lru: "OrderedDict[str, Llama]" = OrderedDict()
+        self.max_loaded = max(1, max_loaded)
         self.current_model_name: Optional[str] = None
         self.lock = asyncio.Lock()
+        self.aggressive_free = aggressive_free
+        # Serialises the (slow) Llama construction so loads never overshoot
+        # ``max_loaded``, without holding ``lock`` for the whole load.
+        self._load_lock = asyncio.Lock()
+        # One future per in-flight load, so concurrent requests for the same
+        # model wait on a single Llama() call instead of queueing their own.
+        self._loading: Dict[str, asyncio.Future] = {}
+        # Pooled keep-alive connections for the cloud APIs, so repeated calls to
+        # Gemini / OpenRouter skip the TCP + TLS handshake
+        self._http = requests.Session()
+        # Set while at least one model is loaded, so readers can wait for a
+        # model without taking any lock.
+        self._ready = asyncio.Event()
+
+    @property
+    def llm(self) -> Optional[Llama]:
+        """The most recently used model instance, or None if nothing is loaded."""
+        if self.current_model_name is None:
+            return None
+        return self._lru.get(self.current_model_name)
+
+    def _do_cleanup(self, clear_gpu: bool = True):
+        """
+        Force garbage collection and release cached GPU memory.
+
+        This blocks for a full heap walk plus a CUDA sync, so callers run it in a
+        worker thread via ``asyncio.to_thread`` to keep the event loop responsive.
+
+        Args:
+            clear_gpu (bool): Also clear the CUDA allocator cache. Defaults to True.
+        """
+        gc.collect()
+        if clear_gpu and _HAS_CUDA:
+            torch.cuda.empty_cache()
 
     async def load_model(
         self, model_name: str, n_ctx: int = 2048, n_gpu_layers: int = 0
@@ -62,8 +156,14 @@ class LLMState:
         Load a local llama.cpp model from disk.
 
         This method handles loading GGUF format models with automatic memory management.
-        If a model is already loaded, it will be unloaded first. GPU memory is cleared
-        when switching models.
+        Up to ``max_loaded`` models are kept resident: loading a model that is already
+        cached only marks it as most recently used, and loading a new one past the
+        limit evicts the least recently used model first. GPU memory is cleared on
+        eviction only if ``aggressive_free`` is enabled.
+
+        The model is constructed in a worker thread outside ``lock``. Concurrent calls
+        for a model that is already being loaded wait for that load to finish rather
+        than starting their own.
 
         Args:
             model_name (str): Name of the model file (must be in MODEL_SAVE_DIR).
@@ -82,43 +182,76 @@ class LLMState:
             >>> await llm_state.load_model("llama-2-7b.gguf", n_ctx=4096, n_gpu_layers=32)
             {"status": "Model loaded", "model_name": "llama-2-7b.gguf"}
         """
-        model_path = os.path.join(MODEL_SAVE_DIR, model_name)
-
-        if not os.path.basename(model_name) == model_name:
+        try:
+            model_path = resolve_model_path(model_name)
+        except ValueError:
             raise HTTPException(status_code=400, detail="Invalid model name")
-        if not os.path.exists(model_path):
+        if not model_path.is_file():
             raise HTTPException(
                 status_code=404, detail=f"Model file {model_name} not found"
             )
 
-        if self.current_model_name == model_name:
+        if model_name in self._lru:
+            self._lru.move_to_end(model_name)
+            self.current_model_name = model_name
             return {"status": "Model already loaded", "model_name": model_name}
 
-        async with self.lock:
-            # Unload existing model if any to free memory
-            if self.llm is not None:
-                del self.llm
-                self.llm = None
-                self.current_model_name = None
-                gc.collect()  # Force garbage collection
-                # Clear GPU memory if using GPU acceleration
-                if n_gpu_layers > 0:
-                    import torch
-
-                    if torch.cuda.is_available():
-                        torch.cuda.empty_cache()
-
-            # Load new model
-            try:
-                self.llm = Llama(
-                    model_path=model_path, n_ctx=n_ctx, n_gpu_layers=n_gpu_layers
-                )
-                self.current_model_name = model_name
+        pending = self._loading.get(model_name)
+        if pending is not None:
+            await asyncio.shield(pending)
+            return {"status": "Model loaded", "model_name": model_name}
+
+        future = asyncio.get_running_loop().create_future()
+        self._loading[model_name] = future
+        try:
+            async with self._load_lock:
+                if model_name in self._lru:
+                    self._lru.move_to_end(model_name)
+                    self.current_model_name = model_name
+                    future.set_result(None)
+                    return {"status": "Model already loaded", "model_name": model_name}
+
+                async with self.lock:
+                    # Evict least recently used models to make room before loading
+                    evicted = False
+                    while len(self._lru) >= self.max_loaded:
+                        evicted_name, evicted_llm = self._lru.popitem(last=False)
+                        del evicted_llm
+                        evicted = True
+                        if self.current_model_name == evicted_name:
+                            self.current_model_name = None
+                    if not self._lru:
+                        self._ready.clear()
+                    if evicted and self.aggressive_free:
+                        await asyncio.to_thread(self._do_cleanup, n_gpu_layers > 0)
+
+                # Load new model
+                try:
+                    llm = await asyncio.to_thread(
+                        Llama, model_path=str(model_path), n_ctx=n_ctx, n_gpu_layers=n_gpu_layers
+                    )
+                except Exception as e:
+                    raise HTTPException(
+                        status_code=500, detail=f"Error loading model: {str(e)}"
+                    )
+
+                async with self.lock:
+                    self._lru[model_name] = llm
+                    self.current_model_name = model_name
+                    self._ready.set()
+                future.set_result(None)
                 return {"status": "Model loaded", "model_name": model_name}
-            except Exception as e:
-                raise HTTPException(
-                    status_code=500, detail=f"Error loading model: {str(e)}"
-                )
+        except BaseException as e:
+            if not future.done():
+                if isinstance(e, asyncio.CancelledError):
+                    future.cancel()
+                else:
+                    future.set_exception(e)
+                    # Mark the exception as retrieved in case nobody else was waiting
+                    future.exception()
+            raise
+        finally:
+            self._loading.pop(model_name, None)
             
     async def get_ai_studio(
             self,
@@ -199,7 +332,7 @@ class LLMState:
             # Streaming endpoint with SSE (Server-Sent Events) for easier parsing
             url = f"{base_url}:streamGenerateContent?alt=sse"
             
-            response = requests.post(
+            response = self._http.post(
                 url=url,
                 headers=headers,
                 data=json.dumps(payload),
@@ -210,7 +343,7 @@ class LLMState:
             # Standard endpoint
             url = f"{base_url}:generateContent"
             
-            response = requests.post(
+            response = self._http.post(
                 url=url,
                 headers=headers,
                 data=json.dumps(payload)
@@ -230,14 +363,21 @@ class LLMState:
         Yields:
             str: Text chunks from the Gemini response.
         """
-        for line in response.iter_lines():
-            if line:
-                line = line.decode('utf-8')
+        # Close the response on exit so the connection is released even when
+        # the consumer stops reading early
+        with response:
+            for line in response.iter_lines():
                 # Gemini SSE lines start with "data: " just like OpenAI
-                if line.startswith('data: '):
+                if line.startswith(b'data: '):
                     data = line[6:] # Remove 'data: '
+                    match = _GEMINI_TEXT_RE.search(data)
+                    if match:
+                        text = _unescape_json_string(match.group(1))
+                        if text:
+                            yield text
+                        continue
                     try:
-                        chunk = json.loads(data)
+                        chunk = orjson.loads(data)
                         # Extract text from Gemini's specific JSON structure
                         if "candidates" in chunk and len(chunk["candidates"]) > 0:
                             candidate = chunk["candidates"][0]
@@ -245,7 +385,7 @@ class LLMState:
                                 text = candidate["content"]["parts"][0].get("text", "")
                                 if text:
                                     yield text
-                    except json.JSONDecodeError:
+                    except orjson.JSONDecodeError:
                         continue
 
 
@@ -274,7 +414,7 @@ class LLMState:
         
         if not stream:
             # Non-streaming response
-            response = requests.post(
+            response = self._http.post(
                 url="https://openrouter.ai/api/v1/chat/completions",
                 headers={
                     "Authorization": f"Bearer {OPEN_ROUTER_KEY}",
@@ -285,7 +425,7 @@ class LLMState:
             return response
         else:
             # Streaming response
-            response = requests.post(
+            response = self._http.post(
                 url="https://openrouter.ai/api/v1/chat/completions",
                 headers={
                     "Authorization": f"Bearer {OPEN_ROUTER_KEY}",
@@ -306,29 +446,40 @@ class LLMState:
         Yields:
             Content chunks from the stream
         """
-        for line in response.iter_lines():
-            if line:
-                line = line.decode('utf-8')
-                if line.startswith('data: '):
+        # Close the response on exit so the connection goes back to the pool even
+        # when the consumer stops early or [DONE] arrives before the body ends
+        with response:
+            for line in response.iter_lines():
+                if line.startswith(b'data: '):
                     data = line[6:]  # Remove 'data: ' prefix
-                    if data == '[DONE]':
+                    if data == b'[DONE]':
                         break
+                    match = _OPENROUTER_CONTENT_RE.search(data)
+                    if match:
+                        content = _unescape_json_string(match.group(1))
+                        if content:
+                            yield content
+                        continue
                     try:
-                        chunk = json.loads(data)
+                        chunk = orjson.loads(data)
                         if 'choices' in chunk and len(chunk['choices']) > 0:
                             delta = chunk['choices'][0].get('delta', {})
                             content = delta.get('content', '')
                             if content:
                                 yield content
-                    except json.JSONDecodeError:
+                    except orjson.JSONDecodeError:
                         continue
 
-    async def unload_model(self):
+    async def unload_model(self, model_name: Optional[str] = None):
         """
-        Unload the current local model and free memory.
+        Unload local models and free memory.
+
+        This method safely unloads llama.cpp models. Garbage collection and GPU
+        cache clearing only run if ``aggressive_free`` is enabled.
 
-        This method safely unloads the llama.cpp model, performs garbage collection,
-        and clears GPU memory if applicable.
+        Args:
+            model_name (Optional[str]): Model to unload. If None, every loaded model
+                is unloaded. Defaults to None.
 
         Returns:
             dict: Status message indicating success or if no model was loaded.
@@ -337,35 +488,76 @@ class LLMState:
             >>> await llm_state.unload_model()
             {"status": "Model unloaded"}
         """
+        # Lock-free fast path: nothing to unload
+        if not self._lru or (model_name is not None and model_name not in self._lru):
+            return {"status": "No model loaded"}
+
         async with self.lock:
-            if self.llm is None:
-                return {"status": "No model loaded"}
-            del self.llm
-            self.llm = None
-            self.current_model_name = None
-            gc.collect()  # Force garbage collection
-            # Clear GPU memory if used
-            import torch
-
-            if torch.cuda.is_available():
-
-                torch.cuda.empty_cache()
+            if model_name is None:
+                if not self._lru:
+                    return {"status": "No model loaded"}
+                self._lru.clear()
+            else:
+                if model_name not in self._lru:
+                    return {"status": "No model loaded"}
+                del self._lru[model_name]
+            if self.current_model_name not in self._lru:
+                self.current_model_name = next(reversed(self._lru), None)
+            if not self._lru:
+                self._ready.clear()
+            if self.aggressive_free:
+                await asyncio.to_thread(self._do_cleanup)
             return {"status": "Model unloaded"}
 
-    def get_llm(self):
+    def get_llm(self, model_name: Optional[str] = None):
         """
-        Get the current LLM instance.
+        Get a loaded LLM instance.
+
+        Args:
+            model_name (Optional[str]): Name of the model to return. If None, the
+                most recently used model is returned. Defaults to None.
 
         Returns:
-            Llama: The currently loaded llama.cpp model instance.
+            Llama: The requested llama.cpp model instance.
 
         Raises:
-            HTTPException: 500 if no model is currently loaded.
+            HTTPException: 500 if the model is not currently loaded.
 
         Example:
             >>> llm = llm_state.get_llm()
             >>> response = llm.create_completion("Hello world")
         """
-        if self.llm is None:
+        llm = self.llm if model_name is None else self._lru.get(model_name)
+        if llm is None:
             raise HTTPException(status_code=500, detail="No model loaded")
-        return self.llm
+        if model_name is not None:
+            self._lru.move_to_end(model_name)
+        return llm
+
+    async def wait_for_llm(self, model_name: Optional[str] = None):
+        """
+        Wait until a model is loaded and return it, without taking any lock.
+
+        If ``model_name`` is currently being loaded, this waits for that load to
+        finish (and raises its error if it fails). Otherwise it waits until any
+        model is loaded.
+
+        Args:
+            model_name (Optional[str]): Name of the model to return. If None, the
+                most recently used model is returned. Defaults to None.
+
+        Returns:
+            Llama: The requested llama.cpp model instance.
+
+        Raises:
+            HTTPException: 500 if the requested model is not loaded once ready.
+
+        Example:
+            >>> llm = await llm_state.wait_for_llm("llama-2-7b.gguf")
+        """
+        pending = self._loading.get(model_name) if model_name is not None else None
+        if pending is not None:
+            await asyncio.shield(pending)
+        else:
+            await self._ready.wait()
+        return self.get_llm(model_name)
@@ -7,20 +7,212 @@ repositories with support for resume capability and progress tracking.
 Features:
 ---------
 - Streaming downloads with progress updates
+- Parallel multi-part downloads using HTTP Range requests
 - Resume capability for interrupted downloads
 - JSON-formatted progress reporting
 - Automatic directory creation
 - File size validation
+- Disk space pre-allocation to keep large model files contiguous on disk
+- SHA-256 verification against the checksum Hugging Face publishes for LFS files
+
+Partial downloads are written to ``<model>.part`` next to the final file. The file is
+split into byte ranges that are fetched concurrently, and the progress of every range
+is tracked in ``<model>.part.state`` so an interrupted download resumes each range where
+it stopped. Once complete, the ``.part`` file is renamed to the model name.
 
 The download function yields JSON progress updates that can be streamed to clients
 for real-time download status monitoring.
 """
 
 import os
+import re
+import hashlib
+import queue
+import threading
 import requests
 import json
+from concurrent.futures import ThreadPoolExecutor
 from introlix.config import HF_MODEL_URL, MODEL_SAVE_DIR
+from introlix.services.model_path import resolve_model_path
+
+PART_SUFFIX = ".part"
+STATE_SUFFIX = ".part.state"
+# Persist the resume state every 64 MiB so a crash loses at most that much progress
+STATE_FLUSH_BYTES = 64 * 1024 * 1024
+# Number of concurrent Range requests per download
+DOWNLOAD_PARTS = 8
+# Files are not split into parts smaller than this
+MIN_PART_SIZE = 16 * 1024 * 1024
+# Bytes read from the network and written to disk per call
+CHUNK_SIZE = 1024 * 1024
+# Chunks buffered between the network readers and the disk writer
+WRITE_QUEUE_SIZE = 16
+# How often blocked queue operations re-check whether the download was stopped
+_POLL_INTERVAL = 0.5
+# (connect, read) timeouts in seconds; the read timeout bounds every socket read, so a
+# stalled range fails instead of blocking executor shutdown forever
+REQUEST_TIMEOUT = (10, 60)
+
+# Hugging Face reports the SHA-256 of LFS files in the X-Linked-Etag header
+_SHA256_RE = re.compile(r"^[0-9a-f]{64}$")
+
+if hasattr(os, "pwrite"):
+    _pwrite = os.pwrite
+else:  # Windows has no pwrite; safe because only the writer thread touches the fd
+    def _pwrite(fd: int, data: bytes, offset: int) -> int:
+        os.lseek(fd, offset, os.SEEK_SET)
+        return os.write(fd, data)
+
+
+def _preallocate(fd: int, size: int):
+    """
+    Reserve ``size`` bytes for the file in a single call.
+
+    Uses ``posix_fallocate`` where available so the filesystem can hand out one
+    contiguous extent up front, and falls back to ``ftruncate`` elsewhere.
+    """
+    try:
+        os.posix_fallocate(fd, 0, size)
+    except (AttributeError, OSError):
+        os.ftruncate(fd, size)
+
+
+def _split_ranges(total_size: int, supports_ranges: bool) -> list:
+    """
+    Split a download into ``[start, end, done]`` byte ranges (``end`` exclusive).
+
+    Falls back to a single range when the server does not accept Range requests
+    or the size is unknown.
+    """
+    if not supports_ranges or total_size <= 0:
+        return [[0, total_size, 0]]
+    parts = max(1, min(DOWNLOAD_PARTS, total_size // MIN_PART_SIZE))
+    step = -(-total_size // parts)
+    return [[start, min(start + step, total_size), 0] for start in range(0, total_size, step)]
+
+
+def _read_state(state_path: str, total_size: int):
+    """Return the saved ranges of a partial download, or None if they don't match."""
+    try:
+        with open(state_path) as f:
+            state = json.load(f)
+    except (FileNotFoundError, ValueError):
+        return None
+    if state.get("total") != total_size or total_size <= 0:
+        return None
+    return state.get("ranges")
+
+
+def _write_state(state_path: str, total_size: int, ranges: list):
+    """Persist the progress of every range of a partial download."""
+    with open(state_path, "w") as f:
+        json.dump({"total": total_size, "ranges": ranges}, f)
+
+
+def _expected_sha256(response: requests.Response):
+    """
+    Return the SHA-256 Hugging Face advertises for a file, or None if unknown.
+
+    The header is set on the initial ``resolve`` response, before the redirect to
+    the CDN, so the redirect history is searched as well.
+    """
+    for r in (*response.history, response):
+        etag = r.headers.get("X-Linked-Etag", "").strip('"').lower()
+        if _SHA256_RE.match(etag):
+            return etag
+    return None
+
+
+def _sha256_file(path: str) -> str:
+    """Hash a file with SHA-256 using hashlib's zero-copy file digest."""
+    with open(path, "rb") as f:
+        return hashlib.file_digest(f, "sha256").hexdigest()
+
+
+def _finalize(part_path: str, state_path: str, model_path: str):
+    """Move a completed partial download into place and drop its resume state."""
+    os.replace(part_path, model_path)
+    try:
+        os.remove(state_path)
+    except FileNotFoundError:
+        pass
+
 
+def _adopt_partial_model(model_path: str, part_path: str, state_path: str, size: int, total_size: int, supports_ranges: bool):
+    """
+    Turn a truncated model file into a resumable ``.part`` download.
+
+    Older versions streamed downloads straight into the model path from offset 0,
+    so an interrupted one left the first ``size`` bytes in place. Those are kept and
+    only the rest is fetched; anything that can't be resumed is deleted instead.
+    """
+    if not supports_ranges or size > total_size:
+        os.remove(model_path)
+        return
+    ranges = _split_ranges(total_size, supports_ranges)
+    for byte_range in ranges:
+        byte_range[2] = max(0, min(size - byte_range[0], byte_range[1] - byte_range[0]))
+    os.replace(model_path, part_path)
+    os.truncate(part_path, total_size)
+    _write_state(state_path, total_size, ranges)
+
+
+def _download_range(url: str, byte_range: list, ranged: bool, chunks: queue.Queue, events: queue.Queue, stop: threading.Event):
+    """
+    Fetch one byte range and hand its chunks to the disk writer.
+
+    Network reads never wait on disk writes: chunks go through the bounded
+    ``chunks`` queue, followed by a ``None`` marker once the range is complete.
+    Failures are reported through ``events``.
+    """
+    start, end, done = byte_range
+    try:
+        headers = {"Range": f"bytes={start + done}-{end - 1}"} if ranged else {}
+        with requests.get(url, headers=headers, stream=True, timeout=REQUEST_TIMEOUT) as r:
+            if r.status_code != (206 if ranged else 200):
+                raise RuntimeError(f"unexpected status {r.status_code}")
+            for chunk in r.iter_content(chunk_size=CHUNK_SIZE):
+                if chunk and not _put(chunks, (byte_range, chunk), stop):
+                    return
+        _put(chunks, (byte_range, None), stop)
+    except Exception as e:
+        events.put(e)
+
+
+def _write_chunks(fd: int, chunks: queue.Queue, events: queue.Queue, stop: threading.Event):
+    """
+    Write queued chunks into ``fd`` at their range offsets until stopped.
+
+    ``byte_range[2]`` is advanced after every write so the caller can persist
+    progress. Written byte counts, finished ranges (``None``) and failures are
+    reported through ``events``.
+    """
+    while not stop.is_set():
+        try:
+            byte_range, chunk = chunks.get(timeout=_POLL_INTERVAL)
+        except queue.Empty:
+            continue
+        if chunk is None:
+            events.put(None)
+            continue
+        try:
+            _pwrite(fd, chunk, byte_range[0] + byte_range[2])
+        except OSError as e:
+            events.put(e)
+            return
+        byte_range[2] += len(chunk)
+        events.put(len(chunk))
+
+
+def _put(q: queue.Queue, item, stop: threading.Event) -> bool:
+    """Put ``item`` on a bounded queue, giving up if the download is stopped."""
+    while not stop.is_set():
+        try:
+            q.put(item, timeout=_POLL_INTERVAL)
+            return True
+        except queue.Full:
+            continue
+    return False
 
 
 def download_hf_model(username: str, repo_id: str, branch_name: str, model_name: str, save_name: str = None):
@@ -61,7 +253,14 @@ def download_hf_model(username: str, repo_id: str, branch_name: str, model_name:
     Note:
         - Downloads are saved to MODEL_SAVE_DIR configured in settings
         - Supports HTTP 206 (Partial Content) for resume capability
-        - Uses 8KB chunks for efficient memory usage
+        - Reads and writes 1 MiB chunks straight to a raw file descriptor
+        - Pre-allocates the full file size and writes chunks at explicit offsets
+        - Splits large files into DOWNLOAD_PARTS ranges fetched in parallel
+        - Overlaps network reads with disk writes through a bounded chunk queue
+        - Verifies the SHA-256 of the finished file when Hugging Face publishes one;
+          on mismatch the partial file is discarded so the next call starts over
+        - An existing model file whose size differs from the remote one is resumed
+          (or re-downloaded) rather than reported as downloaded
     """
     MODEL_URL = HF_MODEL_URL.format(
         username=username,
@@ -70,82 +269,172 @@ def download_hf_model(username: str, repo_id: str, branch_name: str, model_name:
         model_name=model_name,
     )
 
-    if not os.path.isdir(MODEL_SAVE_DIR):
-        os.makedirs(MODEL_SAVE_DIR)
-
-    file_size = 0
+    os.makedirs(MODEL_SAVE_DIR, exist_ok=True)
 
     if save_name:
         model_name = save_name
 
-    MODEL_PATH = os.path.join(MODEL_SAVE_DIR, model_name)
-    if os.path.exists(MODEL_PATH):
-        file_size = os.path.getsize(MODEL_PATH)
+    try:
+        MODEL_PATH = str(resolve_model_path(model_name))
+    except ValueError:
+        yield json.dumps(
+            {
+                "status": "failed",
+                "progress": 0,
+                "downloaded_bytes": 0,
+                "total_bytes": 0,
+                "message": "Invalid model name",
+            }
+        ) + "\n"
+        return
+    PART_PATH = MODEL_PATH + PART_SUFFIX
+    STATE_PATH = MODEL_PATH + STATE_SUFFIX
+
+    # One stat per path instead of separate exists/getsize calls
+    try:
+        model_size = os.stat(MODEL_PATH).st_size
+    except FileNotFoundError:
+        model_size = None
+
+    try:
+        head = requests.head(MODEL_URL, allow_redirects=True, timeout=REQUEST_TIMEOUT)
+    except requests.RequestException:
+        head = None
+    remote_size = int(head.headers.get("Content-Length", 0)) if head is not None and head.status_code == 200 else 0
+
+    # An existing file is complete only if it matches the remote size; when the remote
+    # size can't be checked (offline, no Content-Length) it is trusted as before
+    if model_size is not None and (remote_size <= 0 or model_size == remote_size):
+        yield json.dumps(
+            {
+                "status": "downloaded",
+                "progress": 100,
+                "downloaded_bytes": model_size,
+                "total_bytes": model_size,
+                "message": f"downloaded {model_name}",
+            }
+        ) + "\n"
+        return
+
+    if head is None or head.status_code != 200:
+        yield json.dumps(
+            {
+                "status": "failed",
+                "progress": 0,
+                "downloaded_bytes": 0,
+                "total_bytes": 0,
+                "message": "failed to download",
+            }
+        ) + "\n"
+        return
 
-    # Set up resume headers if file partially exists
-    headers = {"Range": f"bytes={file_size}-"} if file_size > 0 else {}
+    total_size = int(head.headers.get("Content-Length", 0))
+    expected_sha256 = _expected_sha256(head)
+    supports_ranges = total_size > 0 and head.headers.get("Accept-Ranges", "").lower() == "bytes"
 
-    # Start the request
-    with requests.get(MODEL_URL, headers=headers, stream=True) as r:
-        total_size = int(r.headers.get("Content-Length", 0)) + file_size
+    if model_size is not None:
+        # Truncated (or outdated) model file, e.g. left by an interrupted download
+        _adopt_partial_model(MODEL_PATH, PART_PATH, STATE_PATH, model_size, total_size, supports_ranges)
+
+    try:
+        part_size = os.stat(PART_PATH).st_size
+    except FileNotFoundError:
+        part_size = None
+    # A resumable .part file was pre-allocated to exactly the remote size
+    ranges = _read_state(STATE_PATH, total_size) if part_size == total_size else None
+    if ranges is None or not supports_ranges:
+        ranges = _split_ranges(total_size, supports_ranges)
+        if part_size is not None:
+            os.remove(PART_PATH)
+    pending = [byte_range for byte_range in ranges if total_size <= 0 or byte_range[2] < byte_range[1] - byte_range[0]]
+
+    downloaded = sum(byte_range[2] for byte_range in ranges)
+    flushed = downloaded
+    failed = False
+    events = queue.Queue()
+    chunks = queue.Queue(maxsize=WRITE_QUEUE_SIZE)
+    stop = threading.Event()
+    fd = os.open(PART_PATH, os.O_WRONLY | os.O_CREAT | getattr(os, "O_BINARY", 0))
+    # One reader per pending range plus a single disk writer
+    executor = ThreadPoolExecutor(max_workers=len(pending) + 1)
+    try:
+        if total_size > 0:
+            _preallocate(fd, total_size)
+
+        executor.submit(_write_chunks, fd, chunks, events, stop)
+        for byte_range in pending:
+            executor.submit(_download_range, MODEL_URL, byte_range, supports_ranges, chunks, events, stop)
+
+        remaining = len(pending)
+        while remaining:
+            event = events.get()
+            if event is None:
+                remaining -= 1
+                continue
+            if isinstance(event, Exception):
+                failed = True
+                break
+
+            downloaded += event
+            if downloaded - flushed >= STATE_FLUSH_BYTES:
+                _write_state(STATE_PATH, total_size, ranges)
+                flushed = downloaded
+            progress = (
+                (downloaded / total_size) * 100 if total_size > 0 else 0
+            )
 
-        if file_size >= total_size:
             yield json.dumps(
                 {
-                    "status": "downloaded",
-                    "progress": 100,
-                    "downloaded_bytes": total_size,
+                    "status": "downloading",
+                    "progress": round(progress, 2),
+                    "downloaded_bytes": downloaded,
                     "total_bytes": total_size,
-                    "message": f"downloaded {os.path.basename(MODEL_PATH)}",
+                    "message": f"Downloading {model_name}",
                 }
             ) + "\n"
-            return
+    finally:
+        stop.set()
+        executor.shutdown(wait=True)
+        os.close(fd)
+        _write_state(STATE_PATH, total_size, ranges)
+
+    if failed or downloaded < total_size:
+        yield json.dumps(
+            {
+                "status": "failed",
+                "progress": round((downloaded / total_size) * 100, 2) if total_size > 0 else 0,
+                "downloaded_bytes": downloaded,
+                "total_bytes": total_size,
+                "message": "download interrupted, retry to resume",
+            }
+        ) + "\n"
+        return
 
-        if r.status_code in (200, 206):  # 200 = full download, 206 = partial content (resume)
-            mode = "ab" if file_size > 0 else "wb"  # Append mode if resuming, write mode otherwise
-            downloaded = file_size
-            with open(MODEL_PATH, mode) as f:
-                for chunk in r.iter_content(chunk_size=8192):
-                    if chunk:
-                        f.write(chunk)
-                        downloaded += len(chunk)
-                        progress = (
-                            (downloaded / total_size) * 100 if total_size > 0 else 0
-                        )
-
-                        yield json.dumps(
-                            {
-                                "status": "downloading",
-                                "progress": round(progress, 2),
-                                "downloaded_bytes": downloaded,
-                                "total_bytes": total_size,
-                                "message": f"Downloading {os.path.basename(MODEL_PATH)}",
-                            }
-                        ) + "\n"
-        else:
-            if file_size < 0:
-                yield json.dumps(
-                    {
-                        "status": "failed",
-                        "progress": 0,
-                        "downloaded_bytes": 0,
-                        "total_bytes": 0,
-                        "message": "failed to download",
-                    }
-                ) + "\n"
-                return
-            else:
-                yield json.dumps(
-                    {
-                        "status": "downloaded",
-                        "progress": 100,
-                        "downloaded_bytes": total_size,
-                        "total_bytes": total_size,
-                        "message": f"downloaded {os.path.basename(MODEL_PATH)}",
-                    }
-                ) + "\n" 
-                return
+    # Parts arrive out of order, so the digest is computed once the file is complete
+    if expected_sha256 and _sha256_file(PART_PATH) != expected_sha256:
+        os.remove(PART_PATH)
+        os.remove(STATE_PATH)
+        yield json.dumps(
+            {
+                "status": "failed",
+                "progress": 0,
+                "downloaded_bytes": 0,
+                "total_bytes": total_size,
+                "message": "checksum mismatch, download discarded",
+            }
+        ) + "\n"
+        return
 
+    _finalize(PART_PATH, STATE_PATH, MODEL_PATH)
+    yield json.dumps(
+        {
+            "status": "downloaded",
+            "progress": 100,
+            "downloaded_bytes": downloaded,
+            "total_bytes": downloaded,
+            "message": f"downloaded {model_name}",
+        }
+    ) + "\n"
 
 if __name__ == "__main__":
     for update in download_hf_model(
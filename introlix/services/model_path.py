@@ -0,0 +1,39 @@
+"""
+Local Model Path Resolution
+
+This module maps model file names to their location inside MODEL_SAVE_DIR. Names are
+validated once and the resolved path is memoized, so request handlers don't repeat the
+join/basename checks on every call.
+"""
+
+from functools import lru_cache
+from pathlib import Path
+from introlix.config import MODEL_SAVE_DIR
+
+_MODEL_DIR = Path(MODEL_SAVE_DIR).resolve()
+
+
+@lru_cache(maxsize=256)
+def resolve_model_path(model_name: str) -> Path:
+    """
+    Resolve a model file name to its absolute path inside MODEL_SAVE_DIR.
+
+    Args:
+        model_name (str): Name of the model file.
+
+    Returns:
+        Path: Absolute path of the model file. The file may not exist yet.
+
+    Raises:
+        ValueError: If the name is empty or would resolve outside MODEL_SAVE_DIR
+            (e.g. it contains path separators or ``..``).
+
+    Example:
+        >>> resolve_model_path("llama-2-7b.gguf")
+        PosixPath('/home/user/.local/share/introlix/models/llama-2-7b.gguf')
+    """
+    # The file itself is not resolved, so models symlinked into the directory still work
+    path = _MODEL_DIR / model_name
+    if model_name == ".." or path.parent != _MODEL_DIR or path.name != model_name:
+        raise ValueError(f"Invalid model name: {model_name!r}")
+    return path
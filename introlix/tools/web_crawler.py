@@ -7,10 +7,11 @@ and pdfplumber for PDF processing.
 
 Key Features:
 -------------
-- Asynchronous HTTP requests with aiohttp
+- Asynchronous HTTP requests with aiohttp over the app-wide shared session
 - HTML content extraction with trafilatura
 - PDF text extraction with pdfplumber
 - Automatic content type detection
+- Batched crawling with global and per-host concurrency limits
 - Robust error handling
 - SSL/TLS support
 
@@ -21,19 +22,20 @@ Supported Content Types:
 """
 
 import aiohttp
+import logging
 import random
 import asyncio
-import ssl
-import json
 import re
 import trafilatura
-from urllib.parse import urlparse, urljoin
-from typing import Union, List, Set
+from urllib.parse import urlparse
+from typing import Union, List, Optional, Dict
 from pydantic import BaseModel, Field
-from bs4 import BeautifulSoup
 from playwright.async_api import async_playwright
 import pdfplumber
 from io import BytesIO
+from introlix.utils.http import get_session, close_session
+
+logger = logging.getLogger(__name__)
 
 # Multiple realistic user agents to rotate
 USER_AGENTS = [
@@ -58,7 +60,138 @@ class ScrapeResult(BaseModel):
     title: str = Field(description="The title of the webpage")
     description: str = Field(description="A short description of the webpage")
 
-ssl_context = ssl.create_default_context()
+# No Accept-Encoding here: aiohttp fills in "gzip, deflate, br" itself when a brotli
+# decoder is installed (Brotli is a dependency), and never advertises what it can't decode.
+AIOHTTP_HEADERS = {
+    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36",
+    "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
+    "Accept-Language": "en-US,en;q=0.9",
+}
+
+_SCHEMES = ("http://", "https://")
+
+# Content types worth downloading: trafilatura handles (X)HTML, pdfplumber handles PDF
+_FETCHABLE_TYPES = ("text/html", "application/xhtml", "application/pdf")
+
+# Upper bound on a fetched body (HTML or PDF); larger responses are abandoned mid-stream
+MAX_BYTES = 10 * 1024 * 1024
+
+# Markers of client-side rendered pages that may need a real browser to get any text
+_JS_INDICATORS = re.compile(
+    r"react|vue|angular|next\.js|__NEXT_DATA__|ng-app|v-cloak|data-reactroot|data-react-helmet",
+    re.IGNORECASE,
+)
+_JS_SNIFF_BYTES = 64 * 1024
+
+_BROWSER_ARGS = [
+    '--disable-blink-features=AutomationControlled',
+    '--disable-dev-shm-usage',
+    '--disable-web-security',
+    '--disable-features=IsolateOrigins,site-per-process',
+    '--no-sandbox',
+    '--disable-setuid-sandbox',
+    '--disable-accelerated-2d-canvas',
+    '--no-first-run',
+    '--no-zygote',
+    '--disable-gpu',
+    '--hide-scrollbars',
+    '--mute-audio',
+    '--disable-background-timer-throttling',
+    '--disable-backgrounding-occluded-windows',
+    '--disable-renderer-backgrounding',
+]
+
+# One Chromium process for the whole app; each fetch gets its own isolated
+# context, which is cheap compared to launching a browser per URL.
+_PLAYWRIGHT = None
+_BROWSER = None
+_BROWSER_LOOP: Optional[asyncio.AbstractEventLoop] = None
+_BROWSER_LOCK: Optional[asyncio.Lock] = None
+
+
+async def _get_browser():
+    """
+    Return the shared Chromium browser, launching it on first use.
+
+    The browser is relaunched if it crashed/disconnected or was started on a
+    different event loop.
+    """
+    global _PLAYWRIGHT, _BROWSER, _BROWSER_LOOP, _BROWSER_LOCK
+    loop = asyncio.get_running_loop()
+    if _BROWSER_LOOP is not loop:
+        _PLAYWRIGHT = None
+        _BROWSER = None
+        _BROWSER_LOCK = asyncio.Lock()
+        _BROWSER_LOOP = loop
+    if _BROWSER is not None and _BROWSER.is_connected():
+        return _BROWSER
+    async with _BROWSER_LOCK:
+        if _BROWSER is None or not _BROWSER.is_connected():
+            if _PLAYWRIGHT is None:
+                _PLAYWRIGHT = await async_playwright().start()
+            _BROWSER = await _PLAYWRIGHT.chromium.launch(headless=True, args=_BROWSER_ARGS)
+    return _BROWSER
+
+
+async def aclose():
+    """
+    Close the shared browser. Call this once on application shutdown.
+    """
+    global _PLAYWRIGHT, _BROWSER
+    try:
+        if _BROWSER is not None and _BROWSER.is_connected():
+            await _BROWSER.close()
+        if _PLAYWRIGHT is not None:
+            await _PLAYWRIGHT.stop()
+    finally:
+        _BROWSER = None
+        _PLAYWRIGHT = None
+
+
+def _decode_body(body: bytes, charset: Optional[str]) -> str:
+    """
+    Decode a response body using the declared charset, defaulting to UTF-8.
+
+    Unlike ``ClientResponse.text()`` this never runs charset detection over the
+    whole body when the header doesn't declare one.
+    """
+    try:
+        return body.decode(charset or "utf-8", errors="replace")
+    except LookupError:
+        # Unknown charset label in the Content-Type header
+        return body.decode("utf-8", errors="replace")
+
+
+async def _probe(session: aiohttp.ClientSession, url: str) -> Optional[int]:
+    """
+    Cheap HEAD request to skip payloads we would discard anyway.
+
+    Returns 415 for content types that are neither HTML nor PDF, 413 for bodies
+    over ``MAX_BYTES``, and None when the GET should go ahead. Servers that
+    reject HEAD, error out, or omit the headers are given the benefit of the
+    doubt.
+    """
+    try:
+        async with session.head(
+            url,
+            headers=AIOHTTP_HEADERS,
+            allow_redirects=True,
+            timeout=aiohttp.ClientTimeout(total=3),
+        ) as head:
+            if not 200 <= head.status < 300:
+                # 405/501 (HEAD not supported), 403 from HEAD-hostile servers, etc.
+                return None
+            content_type = head.headers.get("Content-Type", "").lower()
+            if content_type and not any(t in content_type for t in _FETCHABLE_TYPES):
+                logger.info("Skipping %s: unsupported content type %s", url, content_type)
+                return 415
+            if head.content_length and head.content_length > MAX_BYTES:
+                logger.warning("Skipping %s: %d bytes exceeds %d", url, head.content_length, MAX_BYTES)
+                return 413
+    except Exception:
+        pass
+    return None
+
 
 async def fetch_page_aiohttp(url: str) -> tuple[str, bool, int]:
     """
@@ -68,28 +201,41 @@ async def fetch_page_aiohttp(url: str) -> tuple[str, bool, int]:
         url (str): The URL to fetch.
     
     Returns:
-        tuple: (content, is_pdf, status_code)
+        tuple: (content, is_pdf, status_code). Bodies larger than ``MAX_BYTES``
+        are not read in full and come back empty with status 413; URLs that a
+        HEAD probe shows are neither HTML nor PDF come back empty with status 415.
     """
-    connector = aiohttp.TCPConnector(ssl=ssl_context)
-    headers = {
-        "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36",
-        "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
-        "Accept-Language": "en-US,en;q=0.9",
-    }
-    async with aiohttp.ClientSession(connector=connector, headers=headers) as session:
-        try:
-            async with session.get(url, timeout=10) as response:
-                status = response.status
-                if status == 200:
-                    content_type = response.headers.get("Content-Type", "").lower()
-                    is_pdf = "application/pdf" in content_type
-                    if is_pdf:
-                        return await response.read(), is_pdf, status
-                    return await response.text(), is_pdf, status
-                return "", False, status
-        except Exception as e:
-            print(f"Aiohttp error for {url}: {str(e)}")
-            return "", False, 0
+    try:
+        session = await get_session()
+        rejected = await _probe(session, url)
+        if rejected:
+            return "", False, rejected
+        async with session.get(
+            url, headers=AIOHTTP_HEADERS, timeout=aiohttp.ClientTimeout(total=10)
+        ) as response:
+            status = response.status
+            if status == 200:
+                content_type = response.headers.get("Content-Type", "").lower()
+                is_pdf = "application/pdf" in content_type
+                # Refuse oversized bodies up front when the server declares the size...
+                if response.content_length and response.content_length > MAX_BYTES:
+                    logger.warning("Skipping %s: %d bytes exceeds %d", url, response.content_length, MAX_BYTES)
+                    return "", False, 413
+                # ...and stop reading once the cap is crossed when it doesn't
+                buf = bytearray()
+                async for chunk in response.content.iter_chunked(65536):
+                    buf.extend(chunk)
+                    if len(buf) > MAX_BYTES:
+                        logger.warning("Skipping %s: body exceeds %d bytes", url, MAX_BYTES)
+                        return "", False, 413
+                body = bytes(buf)
+                if is_pdf:
+                    return body, is_pdf, status
+                return _decode_body(body, response.charset), is_pdf, status
+            return "", False, status
+    except Exception as e:
+        logger.warning("Aiohttp error for %s: %s", url, e)
+        return "", False, 0
 
 async def inject_stealth_scripts(page):
     """
@@ -166,112 +312,101 @@ async def fetch_page_playwright(url: str) -> tuple[str, bool]:
     Returns:
         tuple: (content, is_pdf)
     """
+    context = None
     try:
-        async with async_playwright() as p:
-            browser = await p.chromium.launch(
-                headless=True,
-                args=[
-                    '--disable-blink-features=AutomationControlled',
-                    '--disable-dev-shm-usage',
-                    '--disable-web-security',
-                    '--disable-features=IsolateOrigins,site-per-process',
-                    '--no-sandbox',
-                    '--disable-setuid-sandbox',
-                    '--disable-accelerated-2d-canvas',
-                    '--no-first-run',
-                    '--no-zygote',
-                    '--disable-gpu',
-                    '--hide-scrollbars',
-                    '--mute-audio',
-                    '--disable-background-timer-throttling',
-                    '--disable-backgrounding-occluded-windows',
-                    '--disable-renderer-backgrounding',
-                ]
-            )
-            # Create context with realistic settings
-            context = await browser.new_context(
-                viewport={'width': 1920, 'height': 1080},
-                user_agent=random.choice(USER_AGENTS),
-                locale='en-US',
-                timezone_id='America/New_York',
-                permissions=['geolocation'],
-                geolocation={'latitude': 40.7128, 'longitude': -74.0060},
-                color_scheme='light',
-                java_script_enabled=True,
-                accept_downloads=False,
-                has_touch=False,
-                is_mobile=False,
-                extra_http_headers={
-                    'Accept-Language': 'en-US,en;q=0.9',
-                    'Accept-Encoding': 'gzip, deflate, br',
-                    'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
-                    'Connection': 'keep-alive',
-                    'Upgrade-Insecure-Requests': '1',
-                    'Sec-Fetch-Dest': 'document',
-                    'Sec-Fetch-Mode': 'navigate',
-                    'Sec-Fetch-Site': 'none',
-                    'Sec-Fetch-User': '?1',
-                    'Cache-Control': 'max-age=0',
-                }
-            )
-            
-            page = await context.new_page()
-            
-            # Inject stealth scripts
-            await inject_stealth_scripts(page)
-            
-            # Random mouse movements
-            await page.mouse.move(random.randint(50, 150), random.randint(50, 150))
-            await page.mouse.move(random.randint(150, 250), random.randint(150, 250))
-            
-            # Try different wait strategies with ONE navigation
-            response = None
-            for wait_strategy in ['domcontentloaded', 'load']:
-                try:
-                    response = await page.goto(url, wait_until=wait_strategy, timeout=10000)
-                    break  # Success, exit loop
-                except Exception as e:
-                    print(f"Failed with {wait_strategy}: {e}")
-                    continue
-
-            # If navigation failed completely
-            if not response:
-                raise Exception("Failed to load page")
-            
-            # Check if it's a PDF
-            if response and 'application/pdf' in response.headers.get('content-type', '').lower():
-                pdf_content = await response.body()
-                await browser.close()
-                return pdf_content, True
-            
-            # Scroll down
-            await page.evaluate("window.scrollTo(0, document.body.scrollHeight / 2);")
-            
-            await page.evaluate("window.scrollTo(0, document.body.scrollHeight);")
-            
-            # Scroll back up
-            await page.evaluate("window.scrollTo(0, 0);")
-            
-            # Get the fully rendered HTML
-            html_content = await page.content()
-            
-            await browser.close()
-            return html_content, False
+        browser = await _get_browser()
+        # Create context with realistic settings
+        context = await browser.new_context(
+            viewport={'width': 1920, 'height': 1080},
+            user_agent=random.choice(USER_AGENTS),
+            locale='en-US',
+            timezone_id='America/New_York',
+            permissions=['geolocation'],
+            geolocation={'latitude': 40.7128, 'longitude': -74.0060},
+            color_scheme='light',
+            java_script_enabled=True,
+            accept_downloads=False,
+            has_touch=False,
+            is_mobile=False,
+            extra_http_headers={
+                'Accept-Language': 'en-US,en;q=0.9',
+                'Accept-Encoding': 'gzip, deflate, br',
+                'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
+                'Connection': 'keep-alive',
+                'Upgrade-Insecure-Requests': '1',
+                'Sec-Fetch-Dest': 'document',
+                'Sec-Fetch-Mode': 'navigate',
+                'Sec-Fetch-Site': 'none',
+                'Sec-Fetch-User': '?1',
+                'Cache-Control': 'max-age=0',
+            }
+        )
+        
+        page = await context.new_page()
+        
+        # Inject stealth scripts
+        await inject_stealth_scripts(page)
+        
+        # Random mouse movements
+        await page.mouse.move(random.randint(50, 150), random.randint(50, 150))
+        await page.mouse.move(random.randint(150, 250), random.randint(150, 250))
+        
+        # Try different wait strategies with ONE navigation
+        response = None
+        for wait_strategy in ['domcontentloaded', 'load']:
+            try:
+                response = await page.goto(url, wait_until=wait_strategy, timeout=10000)
+                break  # Success, exit loop
+            except Exception as e:
+                logger.debug("Failed with %s: %s", wait_strategy, e)
+                continue
+
+        # If navigation failed completely
+        if not response:
+            raise Exception("Failed to load page")
+        
+        # Check if it's a PDF
+        if response and 'application/pdf' in response.headers.get('content-type', '').lower():
+            pdf_content = await response.body()
+            return pdf_content, True
+        
+        # Scroll down
+        await page.evaluate("window.scrollTo(0, document.body.scrollHeight / 2);")
+        
+        await page.evaluate("window.scrollTo(0, document.body.scrollHeight);")
+        
+        # Scroll back up
+        await page.evaluate("window.scrollTo(0, 0);")
+        
+        # Get the fully rendered HTML
+        html_content = await page.content()
+        
+        return html_content, False
     except Exception as e:
-        print(f"Playwright error for {url}: {str(e)}")
+        logger.warning("Playwright error for %s: %s", url, e)
         return "", False
+    finally:
+        if context is not None:
+            try:
+                await context.close()
+            except Exception:
+                pass
 
-async def extract_pdf_text(pdf_content: bytes) -> tuple[str, str, str]:
+async def extract_pdf_text(pdf_content: bytes, max_pages: Optional[int] = None) -> tuple[str, str, str]:
     """
     Extract text, title, and description from a PDF document.
 
     This function processes PDF bytes and extracts:
-    - Full text from all pages
+    - Full text from all pages (or the first ``max_pages``)
     - Title from metadata or first page
     - Description from first few lines
 
+    Pages are processed one at a time and their cached layout objects released
+    as soon as their text is taken, so memory stays flat on very long PDFs.
+
     Args:
         pdf_content (bytes): The PDF file content as bytes.
+        max_pages (Optional[int]): Stop after this many pages. Defaults to None (all pages).
 
     Returns:
         tuple[str, str, str]: A tuple containing:
@@ -282,14 +417,28 @@ async def extract_pdf_text(pdf_content: bytes) -> tuple[str, str, str]:
     Note:
         Returns empty strings on extraction errors.
     """
+    # pdfplumber is pure-Python and CPU-bound; run it off the event loop
+    return await asyncio.to_thread(_extract_pdf_sync, pdf_content, max_pages)
+
+def _extract_pdf_sync(pdf_content: bytes, max_pages: Optional[int]) -> tuple[str, str, str]:
+    """
+    Blocking implementation of ``extract_pdf_text``.
+    """
     try:
         with pdfplumber.open(BytesIO(pdf_content)) as pdf:
-            # Extract text from all pages
-            text = "\n".join(page.extract_text() or "" for page in pdf.pages)
-            # Extract title from metadata or first page
+            # Extract text page by page, releasing each page once done
+            parts = []
+            for i, page in enumerate(pdf.pages):
+                if max_pages and i >= max_pages:
+                    break
+                parts.append(page.extract_text() or "")
+                page.flush_cache()
+                page.close()
+            text = "\n".join(parts)
+            # Extract title from metadata or first page (already extracted above)
             title = pdf.metadata.get("Title", "") or ""
-            if not title and pdf.pages:
-                first_page_text = pdf.pages[0].extract_text() or ""
+            if not title and parts:
+                first_page_text = parts[0]
                 # Use first non-empty line as title (common in arXiv PDFs)
                 title_lines = [line.strip() for line in first_page_text.split("\n") if line.strip()]
                 title = title_lines[0] if title_lines else ""
@@ -298,9 +447,28 @@ async def extract_pdf_text(pdf_content: bytes) -> tuple[str, str, str]:
             description = " ".join(description_lines[:3])[:200]  # Limit to 200 chars
         return text, title, description
     except Exception as e:
-        print(f"Error extracting PDF content: {str(e)}")
+        logger.warning("Error extracting PDF content: %s", e)
         return "", "", ""
     
+async def _extract_content(url: str, content: Union[str, bytes], is_pdf: bool) -> tuple[str, str, str]:
+    """
+    Extract (title, description, text) from fetched HTML or PDF content.
+    """
+    # For pdf
+    if is_pdf:
+        # Handle PDF content
+        text, title, description = await extract_pdf_text(content)
+        return title, description, text
+
+    # For HTML web pages, extract main content using trafilatura
+    # bare_extraction returns the Document directly, skipping a JSON dump/parse round-trip
+    doc = await asyncio.to_thread(
+        trafilatura.bare_extraction, content, url=url, with_metadata=True
+    )
+    if not doc:
+        return "", "", ""
+    return doc.title or "", doc.description or "", doc.text or ""
+
 async def web_crawler(url: str) -> Union[ScrapeResult, str]:
     """
     Crawls the pages to gets important details and content from the page.
@@ -319,44 +487,31 @@ async def web_crawler(url: str) -> Union[ScrapeResult, str]:
     if not url:
         return "No URL to scrape"
 
-    # Ensure URL has a protocol
-    if not url.startswith(("http://", "https://")):
-        url = "http://" + url
-
-    html_content, is_pdf, _ = await fetch_page_aiohttp(url)
+    # Ensure URL has a protocol; most sites would just redirect http:// to https://
+    if not url.startswith(_SCHEMES):
+        url = "https://" + url
 
-    # Check for common JS framework indicators in HTML
-    js_indicators = [
-        'react', 'vue', 'angular', 'next.js', 
-        '__NEXT_DATA__', 'ng-app', 'v-cloak',
-        'data-reactroot', 'data-react-helmet'
-    ]
-
-    html_lower = html_content.lower()
-    if any(indicator in html_lower for indicator in js_indicators):
-        html_content, is_pdf = await fetch_page_playwright(url)
+    html_content, is_pdf, status = await fetch_page_aiohttp(url)
+    if status in (413, 415):
+        # Too large or not a page; rendering it in a browser would be no better
+        return f"Failed to fetch content from {url}"
+    fetched_with_browser = False
     if not html_content:
         html_content, is_pdf = await fetch_page_playwright(url)
+        fetched_with_browser = True
         if not html_content:
             return f"Failed to fetch content from {url}"
-    
-    # For pdf
-    if is_pdf:
-        # Handle PDF content
-        text, title, description = await extract_pdf_text(html_content)
-    else:
-        # For HTML web pages
-
-        # Extract main content using trafilatura
-        title, description, text = "", "", ""
- 
-        data = trafilatura.extract(html_content, url=url, output_format="json", with_metadata=True)
-        if data:
-            parsed = json.loads(data)
-            title = parsed.get("title") or ""
-            description = parsed.get("description") or ""
-            text = parsed.get("text") or ""
-    
+
+    title, description, text = await _extract_content(url, html_content, is_pdf)
+
+    # Client-rendered pages ship an empty shell; only then is a real browser worth it
+    if not text and not fetched_with_browser and not is_pdf:
+        # Framework markers live in <head>/the root element, so the first 64 KB is enough
+        if _JS_INDICATORS.search(html_content, 0, _JS_SNIFF_BYTES):
+            rendered, rendered_is_pdf = await fetch_page_playwright(url)
+            if rendered:
+                title, description, text = await _extract_content(url, rendered, rendered_is_pdf)
+
     return ScrapeResult(
         url=url,
         text=text,
@@ -364,6 +519,45 @@ async def web_crawler(url: str) -> Union[ScrapeResult, str]:
         description=description,
     )
 
+async def web_crawler_many(
+    urls: List[str], concurrency: int = 64, per_host: int = 8
+) -> List[Union[ScrapeResult, str, BaseException]]:
+    """
+    Crawl many URLs concurrently.
+
+    Fetches overlap, so wall-clock time tracks the slowest page rather than the
+    sum of all of them. ``concurrency`` caps the total number of in-flight crawls
+    and ``per_host`` caps how many hit the same host at once.
+
+    Args:
+        urls: URLs to scrape.
+        concurrency: Maximum number of crawls running at once. Defaults to 64.
+        per_host: Maximum number of concurrent crawls per host. Defaults to 8.
+
+    Returns:
+        List with one entry per URL, in input order: the ``web_crawler`` result
+        for that URL, or the exception it raised.
+    """
+    semaphore = asyncio.Semaphore(concurrency)
+    host_semaphores: Dict[str, asyncio.Semaphore] = {}
+
+    async def crawl_one(url: str):
+        host = urlparse(url if "://" in url else f"//{url}").netloc
+        host_semaphore = host_semaphores.setdefault(host, asyncio.Semaphore(per_host))
+        # Take the host slot first so a busy host doesn't hold global slots idle
+        async with host_semaphore:
+            async with semaphore:
+                return await web_crawler(url)
+
+    return await asyncio.gather(*[crawl_one(url) for url in urls], return_exceptions=True)
+
 if __name__ == "__main__":
-    result = asyncio.run(web_crawler("https://www.reddit.com/r/Nepal/comments/1nt9bc9/my_thoughts_directly_elected_pm_is_not_a_good/"))
+    async def main():
+        try:
+            return await web_crawler("https://www.reddit.com/r/Nepal/comments/1nt9bc9/my_thoughts_directly_elected_pm_is_not_a_good/")
+        finally:
+            await aclose()
+            await close_session()
+
+    result = asyncio.run(main())
     print(result)
\ No newline at end of file
@@ -10,34 +10,59 @@ Key Features:
 - AI-powered result filtering and relevance ranking
 - Request throttling to prevent rate limiting
 - Automatic retry with exponential backoff
-- Concurrent request prevention with async locks
+- Token-bucket throttling: short bursts, spaced out on average
+- Short-lived LRU cache and single-flight for repeated queries
+- LRU cache of filter LLM answers keyed by the candidate result set
 - Structured result validation with Pydantic
 
 Components:
 -----------
 - WebpageSnippet: Individual search result model
 - SearchResults: Collection of search results
+- BatchSearchResults: Filtered results for several queries, keyed by query id
 - SearXNGClient: Main search client with filtering
 - filter_agent_output_parser: Parser for AI filter responses
 """
 
-import ssl
-import json
+import orjson
 import aiohttp
+import hashlib
 import asyncio
+import random
 import time
 import logging
 from datetime import datetime
-from typing import Optional, List
-from pydantic import Field, BaseModel, ValidationError
+from collections import OrderedDict
+from typing import Optional, List, Dict, Tuple
+from pydantic import Field, BaseModel
 from introlix.config import SEARCHXNG_HOST
 from introlix.agents.baseclass import AgentInput, AgentOutput
 from introlix.agents.base_agent import Agent
+from introlix.utils.http import get_session, close_session
 
 
 logger = logging.getLogger(__name__)
 
-ssl_context = ssl.create_default_context()
+# Search result cache: entry lifetime in seconds and maximum number of entries
+SEARCH_CACHE_TTL = 300.0
+SEARCH_CACHE_SIZE = 512
+
+# Filter LLM answers are keyed by the exact candidate set, so they never go
+# stale; only the number of entries is bounded
+FILTER_CACHE_SIZE = 512
+
+# Filter requests arriving within this many seconds share one LLM call, up to a
+# maximum number of queries per call
+FILTER_BATCH_WINDOW = 0.05
+FILTER_BATCH_SIZE = 8
+
+# Per-result character limits for titles/descriptions sent to the filter LLM
+FILTER_TITLE_CHARS = 160
+FILTER_DESCRIPTION_CHARS = 280
+
+# When filtering, keep at most this many times max_results unique SearXNG rows as
+# candidates for the filter LLM
+FILTER_CANDIDATE_FACTOR = 4
 
 
 class WebpageSnippet(BaseModel):
@@ -68,8 +93,21 @@ class SearchResults(BaseModel):
     results_list: List[WebpageSnippet]
 
 
-FILTER_AGENT_INSTRUCTIONS = f"""
-You are a search result filter. Today's date is {datetime.now().strftime("%Y-%m-%d")}.
+class BatchSearchResults(BaseModel):
+    """
+    Filtered search results for several queries at once.
+
+    Attributes:
+        batches (Dict[str, SearchResults]): Filtered results keyed by query id.
+    """
+
+    batches: Dict[str, SearchResults]
+
+
+# Filtering rules shared by the single-query and batched filter agents.
+# Formatted with the current date when the filter agent is (re)configured
+_FILTER_GUIDELINES = """
+You are a search result filter. Today's date is {date}.
 Your task is to analyze a list of SearXNG search results and determine which ones are relevant
 to the original query based on the link, title and snippet. Return only the relevant results in the specified format. 
 
@@ -77,7 +115,9 @@ to the original query based on the link, title and snippet. Return only the rele
 - E.g. if the query asks about a company "Amce Inc, acme.com", remove results with "acmesolutions.com" or "acme.net" in the link.
 
 Note: All the results will be for a research agent. So, make sure to keep search results which are useful for research.
+"""
 
+FILTER_AGENT_INSTRUCTIONS = _FILTER_GUIDELINES + """
 ## Required Output Structure
 Respond with a JSON object containing:
 {{
@@ -98,13 +138,80 @@ IMPORTANT: Every result in results_list MUST include all three fields: "url", "t
 If a description is not available, use an empty string "" for the description field.
 """
 
+BATCH_FILTER_AGENT_INSTRUCTIONS = _FILTER_GUIDELINES + """
+You will be given several queries, each with an id and its own search results.
+Filter each query's results independently, against that query only.
+
+## Required Output Structure
+Respond with a JSON object containing:
+{{
+    "type": "final",
+    "answer": JSON object with the following structure:
+        {{
+            "batches": {{
+                "<query id>": {{
+                    "results_list": [
+                        {{
+                            "url": "The URL of the webpage",
+                            "title": "The title of the webpage",
+                            "description": "A short description of the webpage (required field, use empty string if no description available)"
+                        }}
+                    ]
+                }}
+            }}
+        }}
+}}
+
+IMPORTANT: Include every query id. Every result in results_list MUST include all three fields: "url", "title", and "description".
+If a description is not available, use an empty string "" for the description field.
+"""
+
+# Per-call user prompts for the filter agents; results are compact JSON
+FILTER_USER_PROMPT = """
+        Original search query: {query}
+        
+        Search results to analyze:
+        {results}
+        
+        Return {max_results} search results or less.
+        """
+
+BATCH_FILTER_QUERY_PROMPT = """
+        Query id: {query_id}
+        Original search query: {query}
+
+        Search results to analyze:
+        {results}
+
+        Return {max_results} search results or less for this query.
+        """
+
+
+def _canonical_url(url: str) -> str:
+    """
+    Normalize a URL for duplicate detection: case, scheme and trailing slash are ignored.
+    """
+    url = url.lower().rstrip("/")
+    if url.startswith("http://"):
+        url = "https://" + url[7:]
+    return url
+
+
+def _backoff_delay(attempt: int, base: float, cap: float = 60.0) -> float:
+    """
+    Exponential backoff for a retry attempt, capped and jittered to 50-150% so
+    concurrent clients don't retry in lockstep.
+    """
+    return min(cap, base * 2**attempt) * (0.5 + random.random())
+
 
 def filter_agent_output_parser(raw_output: str) -> SearchResults:
     """
     Parse and validate filter agent output.
 
-    This function processes the AI filter agent's JSON response, normalizes the structure,
-    and validates it against the SearchResults model.
+    This function processes the AI filter agent's JSON response (already stripped of
+    <think> tags and code fences by ``Agent._parse_output``), normalizes the structure,
+    and checks it against the shape of the SearchResults model.
 
     Args:
         raw_output (str): Raw JSON string from the filter agent.
@@ -112,43 +219,39 @@ def filter_agent_output_parser(raw_output: str) -> SearchResults:
     Returns:
         SearchResults: Validated and structured search results.
 
-    Note:
-        Returns a fallback SearchResults with empty result on parsing errors.
+    Raises:
+        ValueError: If the output is not JSON or doesn't have the SearchResults shape.
+            The agent then hands back the raw string, and the caller falls back to
+            the unfiltered results.
     """
-    try:
-        parsed_output = json.loads(raw_output)
-        if parsed_output.get("type") == "final":
-            if "answer" in parsed_output:
-                answer = parsed_output["answer"]
-            else:
-                answer = parsed_output
-            if isinstance(answer, str):
-                answer = json.loads(answer)
-
-            # Ensure all results have required fields, set defaults for missing optional fields
-            if "results_list" in answer:
-                normalized_results = []
-                for result in answer["results_list"]:
-                    normalized_result = {
-                        "url": result.get("url", ""),
-                        "title": result.get("title", ""),
-                        "description": (
-                            result.get("description")
-                            if "description" in result
-                            else None
-                        ),
-                    }
-                    normalized_results.append(normalized_result)
-                answer["results_list"] = normalized_results
-
-            return SearchResults(**answer)
-    except (json.JSONDecodeError, ValueError, ValidationError) as e:
-        logger.error(f"Error parsing filter agent output: {e}")
-
-    # Fallback for malformed output
-    return SearchResults(
-        results_list=[WebpageSnippet(url="", title="", description=None)]
-    )
+    parsed_output = orjson.loads(raw_output)
+    answer = parsed_output
+    if isinstance(parsed_output, dict) and parsed_output.get("type") == "final":
+        answer = parsed_output.get("answer", parsed_output)
+    if isinstance(answer, str):
+        answer = orjson.loads(answer)
+
+    # Check the few invariants we rely on by hand and build the models without
+    # Pydantic validation: rows must be objects, url/title strings, and
+    # description a string or absent/null.
+    rows = answer.get("results_list") if isinstance(answer, dict) else None
+    if not isinstance(rows, list):
+        raise ValueError("answer has no results_list array")
+    normalized_results = []
+    for result in rows:
+        if not isinstance(result, dict):
+            raise ValueError(f"result is not an object: {result!r}")
+        url = result.get("url") or ""
+        title = result.get("title") or ""
+        description = result.get("description")
+        if not isinstance(url, str) or not isinstance(title, str):
+            raise ValueError(f"url/title must be strings: {result!r}")
+        if description is not None and not isinstance(description, str):
+            raise ValueError(f"description must be a string: {result!r}")
+        normalized_results.append(
+            WebpageSnippet.model_construct(url=url, title=title, description=description)
+        )
+    return SearchResults.model_construct(results_list=normalized_results)
 
 
 class SearXNGClient:
@@ -161,7 +264,7 @@ class SearXNGClient:
 
     Features:
     - Request throttling with configurable delay
-    - Concurrent request prevention
+    - Token-bucket throttling: short bursts, min-delay spacing on average
     - AI-powered result filtering for relevance
     - Automatic retry with exponential backoff
     - Structured result validation
@@ -169,16 +272,41 @@ class SearXNGClient:
     Attributes:
         host (str): SearXNG instance URL.
         model (str): LLM model for result filtering.
-        min_delay (float): Minimum seconds between requests.
-        last_request_time (float): Timestamp of last request.
+        min_delay (float): Minimum average seconds between requests.
+        burst (int): Number of requests allowed back to back before spacing applies.
+        max_concurrent (int): Maximum number of searches in progress at once.
         filter_agent (Agent): AI agent for filtering results.
 
     Example:
-        >>> client = SearXNGClient(model="gemini-2.5-flash", min_delay_between_requests=5.0)
-        >>> results = await client.search("Python programming")
+        >>> async with SearXNGClient(model="gemini-2.5-flash", min_delay_between_requests=5.0) as client:
+        ...     results = await client.search("Python programming")
     """
 
-    def __init__(self, model: str, min_delay_between_requests: float = 5.0):
+    # Static request parts; only the query changes per search
+    _BASE_HEADERS = {
+        "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/129.0.0.0 Safari/537.36",
+        "Accept": "application/json",
+        "Authorization": "Bearer 12345678",
+    }
+    _BASE_PARAMS = {
+        "format": "json",
+        "safesearch": "0",
+    }
+    _TIMEOUT = aiohttp.ClientTimeout(total=30)
+
+    # Shared across clients: callers such as ExplorerAgent create a client per run,
+    # so a per-instance cache would rarely see a repeat query
+    _cache: "OrderedDict[tuple, Tuple[float, List[WebpageSnippet]]]" = OrderedDict()
+    _inflight: Dict[tuple, asyncio.Future] = {}
+    _filter_cache: "OrderedDict[tuple, List[WebpageSnippet]]" = OrderedDict()
+
+    def __init__(
+        self,
+        model: str,
+        min_delay_between_requests: float = 5.0,
+        burst: int = 3,
+        max_concurrent: int = 8,
+    ):
         """
         Initialize the SearXNG search client.
 
@@ -186,14 +314,21 @@ class SearXNGClient:
             model (str): LLM model identifier for result filtering.
             min_delay_between_requests (float): Minimum seconds between search requests.
                                                 Defaults to 5.0 to prevent rate limiting.
+            burst (int): Requests that may go out back to back after an idle period
+                         before the min delay kicks in. Defaults to 3.
+            max_concurrent (int): Maximum searches running at once (request, retries
+                                  and filtering); further callers wait. Defaults to 8.
         """
         self.host = SEARCHXNG_HOST
         self.model = model
 
         # Request throttling configuration
-        self.min_delay = min_delay_between_requests  # Minimum seconds between requests
-        self.last_request_time = 0
-        self._lock = asyncio.Lock()  # Prevent concurrent requests
+        self.min_delay = min_delay_between_requests  # Minimum average seconds between requests
+        self.burst = max(1, burst)
+        self._next_slot = float("-inf")  # time.monotonic() the bucket is next fully drained
+        # Caps searches in progress, independently of the rate the throttle allows
+        self.max_concurrent = max(1, max_concurrent)
+        self._admission = asyncio.Semaphore(self.max_concurrent)
 
         if not self.host.endswith("/search"):
             self.host = (
@@ -209,32 +344,76 @@ class SearXNGClient:
             output_parser=filter_agent_output_parser,
         )
 
+        self._instructions_date = datetime.now().strftime("%Y-%m-%d")
         self.filter_agent = Agent(
             model=model,
-            instruction=FILTER_AGENT_INSTRUCTIONS,
+            instruction=FILTER_AGENT_INSTRUCTIONS.format(date=self._instructions_date),
             config=self.config,
             output_model_class=SearchResults,
         )
 
-    async def _throttled_request(self):
+        # Filters for queries arriving within FILTER_BATCH_WINDOW of each other are
+        # sent to the LLM together in a single prompt
+        self.batch_filter_agent = Agent(
+            model=model,
+            instruction=BATCH_FILTER_AGENT_INSTRUCTIONS.format(date=self._instructions_date),
+            config=AgentInput(
+                name="BatchFilterAgent",
+                description="Filter SearXNG results for several queries at once",
+                output_type=BatchSearchResults,
+            ),
+            output_model_class=BatchSearchResults,
+        )
+        self._filter_batch: list = []
+        self._filter_window_open = False
+        self._filter_tasks: set = set()
+
+    def _refresh_instructions(self):
         """
-        Ensure minimum delay between requests to prevent rate limiting.
+        Re-date the filter agent's instructions if the day has changed since they were built.
+        """
+        today = datetime.now().strftime("%Y-%m-%d")
+        if today != self._instructions_date:
+            self.filter_agent.row_instruction = FILTER_AGENT_INSTRUCTIONS.format(date=today)
+            self.batch_filter_agent.row_instruction = BATCH_FILTER_AGENT_INSTRUCTIONS.format(date=today)
+            self._instructions_date = today
 
-        This method uses an async lock to prevent concurrent requests and enforces
-        a minimum delay between consecutive requests.
+    async def aclose(self):
         """
-        async with self._lock:
-            current_time = time.time()
-            time_since_last = current_time - self.last_request_time
+        Cancel filter batches still pending. Call this when done with the client.
 
-            if time_since_last < self.min_delay:
-                wait_time = self.min_delay - time_since_last
-                logger.info(
-                    f"Throttling: waiting {wait_time:.2f}s before next search..."
-                )
-                await asyncio.sleep(wait_time)
+        The HTTP session is shared app-wide (``introlix.utils.http``) and is
+        closed on application shutdown, not here.
+        """
+        for task in list(self._filter_tasks):
+            task.cancel()
+
+    async def __aenter__(self) -> "SearXNGClient":
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.aclose()
+
+    async def _throttled_request(self):
+        """
+        Ensure minimum delay between requests to prevent rate limiting.
 
-            self.last_request_time = time.time()
+        A token bucket in its virtual-time form (GCRA): up to ``burst`` requests
+        may go out at once after an idle period, after which callers reserve
+        slots ``min_delay`` apart and sleep until theirs. The reservation contains
+        no await, so it is atomic on the event loop and needs no lock.
+        """
+        current_time = time.monotonic()
+        next_slot = max(self._next_slot, current_time)
+        self._next_slot = next_slot + self.min_delay
+        start = next_slot - (self.burst - 1) * self.min_delay
+        if start <= current_time:
+            # Fast path: a token is available
+            return
+
+        wait_time = start - current_time
+        logger.info("Throttling: waiting %.2fs before next search...", wait_time)
+        await asyncio.sleep(wait_time)
 
     async def search(
         self,
@@ -258,75 +437,144 @@ class SearXNGClient:
             List[WebpageSnippet]: List of relevant search results, empty list on failure.
 
         Note:
-            - Uses exponential backoff for retries (5s, 10s, 20s)
+            - Uses jittered exponential backoff for retries (up to 5s, 10s, 20s)
             - Automatically throttles requests based on min_delay
+            - At most max_concurrent searches run at once; cache hits don't count
             - Returns empty list after max_retries failures
+            - Non-empty results are cached for SEARCH_CACHE_TTL seconds (filtered
+              searches only when the filter LLM answered), and identical
+              concurrent searches share a single request
+        """
+        key = (query, max_results, bool(filter_result), self.model if filter_result else None)
+
+        cached = self._cache_get(key)
+        if cached is not None:
+            return cached
+
+        # Single-flight: piggyback on an identical search that is already running
+        pending = self._inflight.get(key)
+        if pending is not None:
+            results = await asyncio.shield(pending)
+            if results is not None:
+                return list(results)
+
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        results = None
+        try:
+            async with self._admission:
+                results, cacheable = await self._search(
+                    query, max_results, max_retries, filter_result
+                )
+            if results and cacheable:
+                self._cache_put(key, results)
+            return results
+        finally:
+            if self._inflight.get(key) is future:
+                del self._inflight[key]
+            # None tells waiters the search was cancelled and they should run their own
+            future.set_result(list(results) if results is not None else None)
+
+    def _cache_get(self, key: tuple) -> Optional[List[WebpageSnippet]]:
+        """
+        Return a copy of the cached results for key, or None if missing or expired.
         """
+        entry = self._cache.get(key)
+        if entry is None:
+            return None
+        stored_at, results = entry
+        if time.monotonic() - stored_at > SEARCH_CACHE_TTL:
+            del self._cache[key]
+            return None
+        self._cache.move_to_end(key)
+        return list(results)
+
+    def _cache_put(self, key: tuple, results: List[WebpageSnippet]):
+        """
+        Store results under key, evicting the least recently used entries.
+        """
+        self._cache[key] = (time.monotonic(), list(results))
+        self._cache.move_to_end(key)
+        while len(self._cache) > SEARCH_CACHE_SIZE:
+            self._cache.popitem(last=False)
+
+    async def _search(
+        self, query: str, max_results: int, max_retries: int, filter_result: bool
+    ) -> Tuple[List[WebpageSnippet], bool]:
+        """
+        Uncached implementation of ``search``.
 
+        Returns the results and whether they may be cached: False for failures and
+        for the truncation fallback used when filtering didn't produce an answer.
+        """
         for attempt in range(max_retries):
             try:
                 # Apply throttling before request
                 await self._throttled_request()
 
-                headers = {
-                    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/129.0.0.0 Safari/537.36",
-                    "Accept": "application/json",
-                    "Authorization": "Bearer 12345678",
-                }
-
-                params = {
-                    "q": query,
-                    "format": "json",
-                    "safesearch": "0",
-                }
-
-                connector = aiohttp.TCPConnector(ssl=ssl_context)
-                timeout = aiohttp.ClientTimeout(total=30)  # 30 second timeout
-
-                async with aiohttp.ClientSession(
-                    connector=connector, timeout=timeout
-                ) as session:
-                    async with session.get(
-                        self.host, params=params, headers=headers
-                    ) as response:
-                        response.raise_for_status()
-                        results = await response.json()
-
-                results_list = [
-                    WebpageSnippet(
-                        url=result.get("url", ""),
-                        title=result.get("title", ""),
-                        description=result.get("content", ""),
+                params = {**self._BASE_PARAMS, "q": query}
+
+                session = await get_session()
+                async with session.get(
+                    self.host, params=params, headers=self._BASE_HEADERS, timeout=self._TIMEOUT
+                ) as response:
+                    response.raise_for_status()
+                    results = await response.json(loads=orjson.loads)
+
+                # SearXNG rows are plain JSON strings; skip per-row Pydantic validation.
+                # Engines often return the same page more than once (http vs https,
+                # trailing slash), so keep only the first hit per canonical URL.
+                # Stop once we have all rows we can use: max_results unfiltered, or
+                # some headroom for the filter LLM to choose from.
+                limit = max_results * FILTER_CANDIDATE_FACTOR if filter_result else max_results
+                results_list = []
+                seen_urls = set()
+                # Bind per-row method lookups once; this loop runs for every result
+                append_result = results_list.append
+                add_seen = seen_urls.add
+                construct = WebpageSnippet.model_construct
+                for result in results.get("results", ()):
+                    get = result.get
+                    url = get("url") or ""
+                    url_key = _canonical_url(url)
+                    if url_key in seen_urls:
+                        continue
+                    add_seen(url_key)
+                    append_result(
+                        construct(
+                            url=url,
+                            title=get("title") or "",
+                            description=get("content") or "",
+                        )
                     )
-                    for result in results.get("results", [])
-                ]
-
-                if filter_result:
-                    return (
-                        await self._filter_results(results_list, query, max_results)
-                        if results_list
-                        else []
-                    )
-                return results_list[:max_results]
+                    if len(results_list) >= limit:
+                        break
+
+                if filter_result and results_list:
+                    filtered = await self._filter_answer(results_list, query, max_results)
+                    if filtered is None:
+                        return results_list[:max_results], False
+                    return filtered, True
+                return results_list[:max_results], True
 
             except asyncio.TimeoutError:
-                logger.info(
-                    f"Timeout on attempt {attempt + 1}/{max_retries} for query: {query}"
+                logger.warning(
+                    "Timeout on attempt %d/%d for query: %s", attempt + 1, max_retries, query
                 )
                 if attempt < max_retries - 1:
-                    backoff_time = (2**attempt) * 5  # Exponential backoff: 5s, 10s, 20s
-                    logger.info(f"Backing off for {backoff_time}s...")
+                    backoff_time = _backoff_delay(attempt, 5)
+                    logger.info("Backing off for %.2fs...", backoff_time)
                     await asyncio.sleep(backoff_time)
                 else:
-                    logger.info(f"Failed after {max_retries} attempts")
-                    return []
+                    logger.info("Failed after %d attempts", max_retries)
+                    return [], False
 
             except Exception as e:
-                logger.error(f"Error on attempt {attempt + 1}/{max_retries}: {e}")
+                logger.error("Error on attempt %d/%d: %s", attempt + 1, max_retries, e)
                 if attempt < max_retries - 1:
-                    await asyncio.sleep(3)
+                    await asyncio.sleep(_backoff_delay(attempt, 2))
                 else:
-                    return []
+                    return [], False
 
     async def _filter_results(
         self, results: List[WebpageSnippet], query: str, max_results: int = 5
@@ -335,7 +583,8 @@ class SearXNGClient:
         Filter search results using AI agent for relevance.
 
         This method uses an LLM to analyze search results and filter out irrelevant
-        or duplicate results based on the original query.
+        or duplicate results based on the original query. Requests made within
+        FILTER_BATCH_WINDOW of each other are combined into one LLM call.
 
         Args:
             results (List[WebpageSnippet]): Raw search results to filter.
@@ -346,35 +595,174 @@ class SearXNGClient:
             List[WebpageSnippet]: Filtered and ranked results.
 
         Note:
-            Falls back to simple truncation if AI filtering fails.
+            Falls back to simple truncation if AI filtering fails. Result sets that
+            already fit in max_results are returned as-is without calling the LLM,
+            and candidate sets filtered before are answered from a cache.
+        """
+        filtered = await self._filter_answer(results, query, max_results)
+        return filtered if filtered is not None else results[:max_results]
+
+    async def _filter_answer(
+        self, results: List[WebpageSnippet], query: str, max_results: int
+    ) -> Optional[List[WebpageSnippet]]:
+        """
+        Like ``_filter_results``, but returns None instead of falling back when
+        the LLM gave no usable answer.
         """
+        if len(results) <= max_results:
+            return results
+
+        # Project the three prompt fields directly; model_dump() walks the full
+        # serializer machinery per row for what is already a flat dict of strings.
+        # Long titles/snippets are cut: the first few hundred characters carry the
+        # relevance signal, the rest only costs prompt tokens.
         serialized_results = [
-            result.model_dump() if isinstance(result, WebpageSnippet) else result
+            {
+                "url": result.url,
+                "title": result.title[:FILTER_TITLE_CHARS],
+                "description": (result.description or "")[:FILTER_DESCRIPTION_CHARS],
+            }
+            if isinstance(result, WebpageSnippet)
+            else result
             for result in results
         ]
 
-        user_prompt = f"""
-        Original search query: {query}
-        
-        Search results to analyze:
-        {json.dumps(serialized_results, indent=2)}
-        
-        Return {max_results} search results or less.
-        """
+        digest = hashlib.blake2b(orjson.dumps(serialized_results), digest_size=16).digest()
+        cache_key = (query, digest, max_results, self.model)
+        cached = self._filter_cache.get(cache_key)
+        if cached is not None:
+            self._filter_cache.move_to_end(cache_key)
+            return list(cached)
 
+        future = asyncio.get_running_loop().create_future()
+        self._filter_batch.append(
+            (query, serialized_results, max_results, cache_key, future)
+        )
+        if not self._filter_window_open:
+            self._filter_window_open = True
+            task = asyncio.create_task(self._flush_filter_batch())
+            self._filter_tasks.add(task)
+            task.add_done_callback(self._on_filter_flush_done)
+        return await future
+
+    def _on_filter_flush_done(self, task: asyncio.Task):
+        """
+        Forget a finished flush task; if it was cancelled before it ever ran,
+        release the callers still queued on it.
+        """
+        self._filter_tasks.discard(task)
+        if task.cancelled() and self._filter_window_open:
+            self._filter_window_open = False
+            pending, self._filter_batch = self._filter_batch, []
+            for request in pending:
+                request[-1].cancel()
+
+    async def _flush_filter_batch(self):
+        """
+        Wait for the batching window to close, then filter everything queued during it.
+        """
+        pending = []
         try:
-            agent_output = await self.filter_agent.run(user_prompt)
-            if isinstance(agent_output, AgentOutput):
-                result = agent_output.result
-                if isinstance(result, SearchResults):
-                    return result.results_list
-            return []
-        except Exception as e:
-            logger.error("Error filtering results:", str(e))
-            return results[:max_results]
+            try:
+                await asyncio.sleep(FILTER_BATCH_WINDOW)
+            finally:
+                self._filter_window_open = False
+                pending, self._filter_batch = self._filter_batch, []
+
+            # Callers that were cancelled while waiting no longer need an answer
+            pending = [request for request in pending if not request[-1].done()]
+            chunks = [
+                pending[i : i + FILTER_BATCH_SIZE]
+                for i in range(0, len(pending), FILTER_BATCH_SIZE)
+            ]
+            await asyncio.gather(*(self._run_filter_batch(chunk) for chunk in chunks))
+        finally:
+            # Never leave a caller waiting if this task is cancelled mid-way
+            for request in pending:
+                if not request[-1].done():
+                    request[-1].cancel()
+
+    async def _run_filter_batch(self, batch: list):
+        """
+        Filter one batch of queued requests and resolve their futures with the
+        filtered results, or None where there is no usable answer.
+        """
+        try:
+            self._refresh_instructions()
+            if len(batch) == 1:
+                query, serialized_results, max_results, _, _ = batch[0]
+                outcomes = [await self._filter_one(query, serialized_results, max_results)]
+            else:
+                outcomes = await self._filter_many(batch)
+        except Exception:
+            logger.exception("Error filtering results")
+            outcomes = [None] * len(batch)
+
+        for (_, _, _, cache_key, future), outcome in zip(batch, outcomes):
+            # Remember real answers only, never the truncation fallback
+            if outcome is not None:
+                self._filter_cache[cache_key] = list(outcome)
+                self._filter_cache.move_to_end(cache_key)
+                while len(self._filter_cache) > FILTER_CACHE_SIZE:
+                    self._filter_cache.popitem(last=False)
+            if not future.done():
+                future.set_result(outcome)
+
+    async def _filter_one(
+        self, query: str, serialized_results: list, max_results: int
+    ) -> Optional[List[WebpageSnippet]]:
+        """
+        Filter the results for a single query with the filter agent.
 
+        Returns None if the agent's answer couldn't be parsed.
+        """
+        user_prompt = FILTER_USER_PROMPT.format(
+            query=query,
+            results=orjson.dumps(serialized_results).decode(),
+            max_results=max_results,
+        )
+
+        agent_output = await self.filter_agent.run(user_prompt)
+        if isinstance(agent_output, AgentOutput):
+            result = agent_output.result
+            if isinstance(result, SearchResults):
+                return result.results_list
+        return None
+
+    async def _filter_many(self, batch: list) -> List[Optional[List[WebpageSnippet]]]:
+        """
+        Filter the results for several queries with one batch filter agent call.
+
+        Returns one entry per request; None for queries missing from the answer.
+        """
+        user_prompt = "\n".join(
+            BATCH_FILTER_QUERY_PROMPT.format(
+                query_id=query_id,
+                query=query,
+                results=orjson.dumps(serialized_results).decode(),
+                max_results=max_results,
+            )
+            for query_id, (query, serialized_results, max_results, _, _) in enumerate(batch)
+        )
+
+        agent_output = await self.batch_filter_agent.run(user_prompt)
+        batches = {}
+        if isinstance(agent_output, AgentOutput):
+            result = agent_output.result
+            if isinstance(result, BatchSearchResults):
+                batches = result.batches
+        return [
+            batches[str(query_id)].results_list if str(query_id) in batches else None
+            for query_id in range(len(batch))
+        ]
 
 if __name__ == "__main__":
-    client = SearXNGClient(model="gemini-2.5-flash", min_delay_between_requests=6.0)
-    results = asyncio.run(client.search(query="What is coding?"))
+    async def main():
+        try:
+            async with SearXNGClient(model="gemini-2.5-flash", min_delay_between_requests=6.0) as client:
+                return await client.search(query="What is coding?")
+        finally:
+            await close_session()
+
+    results = asyncio.run(main())
     print(results)
@@ -0,0 +1,66 @@
+"""
+Shared HTTP Session
+
+One process-wide aiohttp session for outbound HTTP (web crawling, SearXNG search),
+so every caller draws from the same pool of keep-alive connections, DNS cache and
+TLS context instead of each opening its own. Close it once on application shutdown
+with ``close_session``.
+"""
+
+import ssl
+import asyncio
+import aiohttp
+from typing import Optional
+
+# Built once at import: loading the CA bundle is disk I/O, and connections that share
+# one context can resume TLS sessions. Every outbound aiohttp client should use it.
+ssl_context = ssl.create_default_context()
+
+_SESSION: Optional[aiohttp.ClientSession] = None
+_SESSION_LOOP: Optional[asyncio.AbstractEventLoop] = None
+
+
+async def get_session() -> aiohttp.ClientSession:
+    """
+    Return the shared aiohttp session, creating it on first use.
+
+    A new session is created if the previous one was closed or belongs to a
+    different event loop (e.g. across separate ``asyncio.run`` calls). Callers
+    pass their own headers and timeouts per request. Cookies are not kept, so
+    nothing set by one site or service is sent on behalf of another caller.
+    """
+    global _SESSION, _SESSION_LOOP
+    loop = asyncio.get_running_loop()
+    if _SESSION is None or _SESSION.closed or _SESSION_LOOP is not loop:
+        try:
+            # c-ares lookups on the event loop instead of getaddrinfo on the thread pool
+            resolver = aiohttp.AsyncResolver()
+        except RuntimeError:
+            # aiodns not installed; keep aiohttp's default threaded resolver
+            resolver = None
+        connector = aiohttp.TCPConnector(
+            ssl=ssl_context,
+            resolver=resolver,
+            limit=200,
+            limit_per_host=32,
+            use_dns_cache=True,
+            ttl_dns_cache=300,
+            # Low-volume callers (SearXNG) are often minutes apart; keep their
+            # connection warm instead of re-doing the TLS handshake
+            keepalive_timeout=120,
+        )
+        _SESSION = aiohttp.ClientSession(
+            connector=connector, cookie_jar=aiohttp.DummyCookieJar()
+        )
+        _SESSION_LOOP = loop
+    return _SESSION
+
+
+async def close_session():
+    """
+    Close the shared HTTP session. Call this once on application shutdown.
+    """
+    global _SESSION
+    if _SESSION is not None and not _SESSION.closed:
+        await _SESSION.close()
+    _SESSION = None
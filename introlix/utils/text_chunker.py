@@ -1,7 +1,33 @@
 import tiktoken
 import re
+from functools import lru_cache
 from typing import List, Dict, Tuple
 
+# Only short strings (words, typical sentences) are worth memoizing: they repeat
+# constantly, e.g. every word of the previous chunk is counted when adding overlap
+_CACHED_TEXT_MAX_CHARS = 512
+
+# encode_ordinary_batch spins up a thread pool per call, which only pays off for
+# many texts; shorter lists are counted one by one (and hit the memo above)
+_BATCH_MIN_TEXTS = 64
+
+# Sentence boundary: whitespace after terminal punctuation, before a capital letter
+_SENT_RE = re.compile(r'(?<=[.!?])\s+(?=[A-Z])')
+# Paragraph boundary: a blank (or whitespace-only) line
+_PARA_RE = re.compile(r'\n\s*\n')
+
+
+@lru_cache(maxsize=8)
+def _get_encoding(model_name: str) -> tiktoken.Encoding:
+    # One Encoding per name, shared by every chunker (Encoding is thread-safe)
+    return tiktoken.get_encoding(model_name)
+
+
+@lru_cache(maxsize=16384)
+def _count_tokens_cached(model_name: str, text: str) -> int:
+    return len(_get_encoding(model_name).encode_ordinary(text))
+
+
 class TextChunker:
     def __init__(self, model_name: str = "cl100k_base", chunk_size: int = 1000, overlap: int = 200):
         """
@@ -15,19 +41,30 @@ class TextChunker:
         self.model_name = model_name
         self.chunk_size = chunk_size
         self.overlap = overlap
-        self.encoding = tiktoken.get_encoding(model_name)
+        self.encoding = _get_encoding(model_name)
 
     def count_tokens(self, text: str) -> int:
         """Count tokens in text"""
         if not text or not text.strip():
             return 0
-        return len(self.encoding.encode(text))
+        if len(text) <= _CACHED_TEXT_MAX_CHARS:
+            return _count_tokens_cached(self.model_name, text)
+        return len(self.encoding.encode_ordinary(text))
+
+    def count_tokens_batch(self, texts: List[str]) -> List[int]:
+        """Count tokens for many texts at once, encoding large lists in parallel"""
+        if len(texts) < _BATCH_MIN_TEXTS:
+            return [self.count_tokens(text) for text in texts]
+        counts = [0] * len(texts)
+        indices = [i for i, text in enumerate(texts) if text and text.strip()]
+        encoded = self.encoding.encode_ordinary_batch([texts[i] for i in indices])
+        for i, tokens in zip(indices, encoded):
+            counts[i] = len(tokens)
+        return counts
     
     def split_by_sentences(self, text: str) -> List[str]:
         """Split text into sentences while preserving meaning"""
-        # Enhanced sentence splitting pattern
-        sentence_pattern = r'(?<=[.!?])\s+(?=[A-Z])'
-        sentences = re.split(sentence_pattern, text)
+        sentences = _SENT_RE.split(text)
         
         # Clean and filter sentences
         sentences = [s.strip() for s in sentences if s.strip()]
@@ -35,7 +72,7 @@ class TextChunker:
     
     def split_by_paragraphs(self, text: str) -> List[str]:
         """Split text into paragraphs"""
-        paragraphs = re.split(r'\n\s*\n', text)
+        paragraphs = _PARA_RE.split(text)
         paragraphs = [p.strip() for p in paragraphs if p.strip()]
         return paragraphs
 
@@ -55,74 +92,77 @@ class TextChunker:
         
         paragraphs = self.split_by_paragraphs(text)
         chunks = []
-        current_chunk = ""
+        # Pieces (and their separators) of the chunk being built; joined once on flush
+        current_parts: List[str] = []
         current_tokens = 0
         chunk_id = 0
 
-        for paragraph in paragraphs:
-            paragraph_tokens = self.count_tokens(paragraph)
-
+        for paragraph, paragraph_tokens in zip(paragraphs, self.count_tokens_batch(paragraphs)):
             # if a single paragraph exceeds chunk size, split it by sentences
             if paragraph_tokens > self.chunk_size:
                 sentences = self.split_by_sentences(paragraph)
 
-                for sentence in sentences:
-                    sentence_tokens = self.count_tokens(sentence)
-
+                for sentence, sentence_tokens in zip(sentences, self.count_tokens_batch(sentences)):
                     if current_tokens + sentence_tokens <= self.chunk_size:
-                        current_chunk += (" " if current_chunk else "") + sentence
+                        if current_parts:
+                            current_parts.append(" ")
+                        current_parts.append(sentence)
                         current_tokens += sentence_tokens
                     else:
-                        if current_chunk.strip():
-                            if chunks:
-                                current_chunk, current_tokens = self._add_overlap(chunks[-1]['text'], current_chunk)
-                            chunks.append(self._create_chunk_dict(current_chunk, chunk_id, current_tokens))
+                        if current_parts:
+                            chunks.append(self._flush_chunk(chunks, current_parts, chunk_id, current_tokens))
                             chunk_id += 1
 
-                        current_chunk = sentence
+                        current_parts = [sentence]
                         current_tokens = sentence_tokens
                         
-                if current_chunk.strip():
-                    if chunks:
-                        current_chunk, current_tokens = self._add_overlap(chunks[-1]['text'], current_chunk)
-                    chunks.append(self._create_chunk_dict(current_chunk, chunk_id, current_tokens))
+                if current_parts:
+                    chunks.append(self._flush_chunk(chunks, current_parts, chunk_id, current_tokens))
                     chunk_id += 1
-                    current_chunk = ""
+                    current_parts = []
                     current_tokens = 0
 
             elif paragraph_tokens + current_tokens <= self.chunk_size:
-                current_chunk += ("\n\n" if current_chunk else "") + paragraph
+                if current_parts:
+                    current_parts.append("\n\n")
+                current_parts.append(paragraph)
                 current_tokens += paragraph_tokens
             else:
-                if current_chunk.strip():
-                    if chunks:
-                        current_chunk, current_tokens = self._add_overlap(chunks[-1]['text'], current_chunk)
-                    chunks.append(self._create_chunk_dict(current_chunk, chunk_id, current_tokens))
+                if current_parts:
+                    chunks.append(self._flush_chunk(chunks, current_parts, chunk_id, current_tokens))
                     chunk_id += 1
 
-                current_chunk = paragraph
+                current_parts = [paragraph]
                 current_tokens = paragraph_tokens
 
-        if current_chunk.strip():
-            if chunks:
-                current_chunk, current_tokens = self._add_overlap(chunks[-1]['text'], current_chunk)
-            chunks.append(self._create_chunk_dict(current_chunk, chunk_id, current_tokens))
+        if current_parts:
+            chunks.append(self._flush_chunk(chunks, current_parts, chunk_id, current_tokens))
 
         return chunks
 
+    def _flush_chunk(self, chunks: List[Dict], parts: List[str], chunk_id: int, token_count: int) -> Dict:
+        """Join the buffered parts into a chunk, prefixed with overlap from the previous chunk"""
+        current_chunk = "".join(parts)
+        if chunks:
+            current_chunk, token_count = self._add_overlap(chunks[-1]['text'], current_chunk)
+        return self._create_chunk_dict(current_chunk, chunk_id, token_count)
+
     def _add_overlap(self, previous_chunk: str, current_chunk: str) -> Tuple[str, int]:
         """Add overlap to the current chunk"""
         words = previous_chunk.split()
-        overlap_text = ""
+        # Collected back to front, reversed once when joining
+        overlap_words = []
         overlap_tokens = 0
 
         for word in reversed(words):
             test_tokens = self.count_tokens(word)
             if overlap_tokens + test_tokens <= self.overlap:
-                overlap_text = word + (" " if overlap_text else "") + overlap_text
+                overlap_words.append(word)
                 overlap_tokens += test_tokens
 
-        new_chunk = overlap_text + (" " if overlap_text else "") + current_chunk
+        overlap_words.reverse()
+        overlap_words.append(current_chunk)
+        new_chunk = " ".join(overlap_words)
         new_chunk_tokens = self.count_tokens(new_chunk)
         return new_chunk, new_chunk_tokens
     